@@ -0,0 +1,45 @@
+"""message outbox
+
+Revision ID: 5d1e8a3c7f42
+Revises: 22c54785b00b
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e8a3c7f42'
+down_revision: Union[str, Sequence[str], None] = '22c54785b00b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('messages', sa.Column('delivery_status', sa.String(length=16), nullable=True))
+    op.add_column('messages', sa.Column('delivered_at', sa.DateTime(), nullable=True))
+    op.add_column('messages', sa.Column('delivery_error', sa.String(length=255), nullable=True))
+    op.create_table('message_outbox',
+    sa.Column('message_id', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('available_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('message_id')
+    )
+    op.create_index(op.f('ix_message_outbox_available_at'), 'message_outbox', ['available_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_message_outbox_available_at'), table_name='message_outbox')
+    op.drop_table('message_outbox')
+    op.drop_column('messages', 'delivery_error')
+    op.drop_column('messages', 'delivered_at')
+    op.drop_column('messages', 'delivery_status')
@@ -0,0 +1,58 @@
+"""messages indexes
+
+Revision ID: 8b2f4c6d9e13
+Revises: 5d1e8a3c7f42
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2f4c6d9e13'
+down_revision: Union[str, Sequence[str], None] = '5d1e8a3c7f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индексы строим без блокировки записи в таблицу, CONCURRENTLY требует работы вне транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_employee_id_created_at',
+            'messages',
+            ['employee_id', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_messages_employee_id_unread',
+            'messages',
+            ['employee_id'],
+            unique=False,
+            postgresql_where=sa.text('is_read = false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_employee_id_unread',
+            table_name='messages',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_messages_employee_id_created_at',
+            table_name='messages',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
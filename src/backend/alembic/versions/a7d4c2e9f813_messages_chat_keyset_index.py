@@ -0,0 +1,56 @@
+"""messages chat keyset index
+
+Revision ID: a7d4c2e9f813
+Revises: f2a8c6d4b391
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4c2e9f813'
+down_revision: Union[str, Sequence[str], None] = 'f2a8c6d4b391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Курсорная пагинация чата сортирует по (created_at, id) - id добавляем в индекс
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_employee_id_created_at_id',
+            'messages',
+            ['employee_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_messages_employee_id_created_at',
+            table_name='messages',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_employee_id_created_at',
+            'messages',
+            ['employee_id', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_messages_employee_id_created_at_id',
+            table_name='messages',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,31 @@
+"""session revocation revoked_at
+
+Revision ID: b5e1f3a8c260
+Revises: a7d4c2e9f813
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1f3a8c260'
+down_revision: Union[str, Sequence[str], None] = 'a7d4c2e9f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'auth_session_revocation',
+        sa.Column('revoked_at', sa.Float(), server_default=sa.text('extract(epoch from now())'), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('auth_session_revocation', 'revoked_at')
@@ -0,0 +1,53 @@
+"""chat summary
+
+Revision ID: c4a7e2b91f05
+Revises: 8b2f4c6d9e13
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2b91f05'
+down_revision: Union[str, Sequence[str], None] = '8b2f4c6d9e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_summary',
+    sa.Column('employee_id', sa.BigInteger(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('employee_id')
+    )
+    op.create_index(op.f('ix_chat_summary_last_message_at'), 'chat_summary', ['last_message_at'], unique=False)
+    # Первичное заполнение сводки, далее она поддерживается приложением
+    op.execute(
+        """
+        INSERT INTO chat_summary (employee_id, unread_count, last_message_at, last_message_id)
+        SELECT DISTINCT ON (m.employee_id)
+            m.employee_id,
+            (SELECT count(*) FROM messages u WHERE u.employee_id = m.employee_id AND u.is_read = false),
+            m.created_at,
+            m.id
+        FROM messages m
+        ORDER BY m.employee_id, m.created_at DESC, m.id DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_chat_summary_last_message_at'), table_name='chat_summary')
+    op.drop_table('chat_summary')
@@ -0,0 +1,39 @@
+"""session revocation
+
+Revision ID: f2a8c6d4b391
+Revises: e9d3b5a17c28
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c6d4b391'
+down_revision: Union[str, Sequence[str], None] = 'e9d3b5a17c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('auth_session_revocation',
+    sa.Column('session_id', sa.String(length=64), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expired_at', sa.DateTime(), server_default=sa.text("(NOW() + interval '3 days')"), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['auth_user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id')
+    )
+    op.create_index(op.f('ix_auth_session_revocation_expired_at'), 'auth_session_revocation', ['expired_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_auth_session_revocation_expired_at'), table_name='auth_session_revocation')
+    op.drop_table('auth_session_revocation')
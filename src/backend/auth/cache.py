@@ -0,0 +1,55 @@
+import time
+
+from auth.constants import SESSION_CACHE_MAX_SIZE, SESSION_CACHE_TTL_IN_SECONDS
+from users.schemas import UserReadSchema
+
+
+class SessionCache:
+    """Кэш пользователей по номеру сессии с ограниченным временем жизни записей."""
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        # id сессии -> (момент устаревания по time.monotonic, пользователь)
+        self._entries: dict[str, tuple[float, UserReadSchema]] = {}
+
+    def get(self, session_id: str) -> UserReadSchema | None:
+        """Получаем пользователя из кэша, устаревшую запись удаляем."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[session_id]
+            return None
+        return user
+
+    def set(self, session_id: str, user: UserReadSchema, ttl: float | None = None) -> None:
+        """Кладем пользователя в кэш; ttl не больше времени жизни самой сессии."""
+        ttl = self.ttl if ttl is None else min(self.ttl, ttl)
+        if ttl <= 0:
+            return
+
+        if session_id not in self._entries and len(self._entries) >= self.max_size:
+            now = time.monotonic()
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            # Если устаревших нет, вытесняем самую старую запись
+            if len(self._entries) >= self.max_size:
+                del self._entries[next(iter(self._entries))]
+
+        self._entries[session_id] = (time.monotonic() + ttl, user)
+
+    def invalidate(self, session_id: str) -> None:
+        """Удаляем сессию из кэша (выход пользователя)."""
+        self._entries.pop(session_id, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Удаляем все сессии пользователя (изменение активности или роли)."""
+        self._entries = {k: v for k, v in self._entries.items() if v[1].id != user_id}
+
+    def clear(self) -> None:
+        """Очищаем кэш полностью."""
+        self._entries.clear()
+
+
+session_cache = SessionCache(SESSION_CACHE_TTL_IN_SECONDS, SESSION_CACHE_MAX_SIZE)
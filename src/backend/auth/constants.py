@@ -4,4 +4,13 @@ SESSION_ID_LENGTH = 64
 
 ERROR_MESSAGE_WRONG_LOGIN_DATA = 'Неверные данные для входа!'
 
+AUTH_SESSION_MODE_DB = 'db'
+AUTH_SESSION_MODE_TOKEN = 'token'
+# Отозванные токены из БД подгружаются в память каждого процесса с этой периодичностью
+REVOCATION_SYNC_FREQ_IN_SECONDS = 30
+
 TOKEN_HEX_BASE = 32
+
+# Кэш пользователей по сессии: в пределах процесса бэкенда, изменения в других процессах видны через TTL
+SESSION_CACHE_TTL_IN_SECONDS = 30
+SESSION_CACHE_MAX_SIZE = 1000
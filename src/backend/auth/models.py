@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import text
 
@@ -38,5 +38,36 @@ class SessionsOrm(AppBaseClass):
     user: Mapped[UsersOrm] = relationship(
         UsersOrm,
         back_populates='session',
-        lazy='joined',
+        lazy='raise',
+    )
+
+
+class SessionRevocationsOrm(AppBaseClass):
+    """Модель таблицы отзывов подписанных токенов сессий.
+
+    Запись отзывает либо один токен (session_id), либо все токены пользователя,
+    выпущенные до ее создания (user_id). После expired_at все затронутые токены
+    истекли сами, и запись можно удалить.
+    """
+
+    __tablename__ = 'auth_session_revocation'
+
+    session_id: Mapped[str] = mapped_column(
+        String(SESSION_ID_LENGTH), nullable=True, unique=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey(UsersOrm.id, ondelete='CASCADE'), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False
+    )
+    # Момент отзыва по time.time() - в той же шкале, что и iat токенов
+    revoked_at: Mapped[float] = mapped_column(
+        Float, server_default=text('extract(epoch from now())'), nullable=False
+    )
+    expired_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=text(f"(NOW() + interval '{SESSION_DURATION_IN_DAYS} days')"),
+        nullable=False,
+        index=True,
     )
@@ -0,0 +1,78 @@
+import time
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.models import SessionRevocationsOrm
+from auth.schemas import RevocationListSchema, SessionTokenSchema
+
+
+class RevocationList:
+    """Отозванные токены сессий в памяти процесса, копия таблицы отзывов."""
+
+    def __init__(self) -> None:
+        self._sessions: set[str] = set()
+        self._users: dict[int, float] = {}
+
+    def is_revoked(self, token: SessionTokenSchema) -> bool:
+        """Проверяем, отозван ли токен сам по себе или вместе со всеми токенами пользователя."""
+        if token.sid in self._sessions:
+            return True
+        revoked_at = self._users.get(token.user_id)
+        return revoked_at is not None and token.iat <= revoked_at
+
+    async def revoke_session(self, session: AsyncSession, token: SessionTokenSchema) -> None:
+        """Отзываем один токен (выход пользователя), повторный выход с тем же токеном не ошибка."""
+        stmt = pg_insert(SessionRevocationsOrm).values(
+            session_id=token.sid, user_id=token.user_id, revoked_at=time.time()
+        ).on_conflict_do_nothing(index_elements=[SessionRevocationsOrm.session_id])
+        await session.execute(stmt)
+        await session.commit()
+        # Память меняем только после успешного коммита
+        self._sessions.add(token.sid)
+        logger.log('DB_ACCESS', f'Entry creation: model={SessionRevocationsOrm.__name__}, sid revoked')
+
+    def revoke_user(self, session: AsyncSession, user_id: int) -> float:
+        """Добавляем в транзакцию отзыв всех выпущенных токенов пользователя (блокировка, смена роли).
+
+        Коммит за вызывающим кодом, после него отзыв применяется через apply_user_revocation.
+        """
+        revoked_at = time.time()
+        session.add(SessionRevocationsOrm(user_id=user_id, revoked_at=revoked_at))
+        return revoked_at
+
+    def apply_user_revocation(self, user_id: int, revoked_at: float) -> None:
+        """Учитываем в памяти зафиксированный в БД отзыв токенов пользователя."""
+        self._users[user_id] = max(self._users.get(user_id, 0), revoked_at)
+        logger.log('DB_ACCESS', f'Entry creation: model={SessionRevocationsOrm.__name__}, user_id={user_id}')
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Перечитываем действующие отзывы из БД, в т.ч. сделанные другими процессами."""
+        query = select(
+            SessionRevocationsOrm.session_id,
+            SessionRevocationsOrm.user_id,
+            SessionRevocationsOrm.revoked_at,
+        ).where(SessionRevocationsOrm.expired_at > func.now())
+        rows = (await session.execute(query)).all()
+
+        sessions: set[str] = set()
+        users: dict[int, float] = {}
+        for row in rows:
+            if row.session_id is not None:
+                sessions.add(row.session_id)
+            else:
+                users[row.user_id] = max(users.get(row.user_id, 0), row.revoked_at)
+        self._sessions, self._users = sessions, users
+        logger.log(
+            'DB_ACCESS',
+            f'Data retrieve: model={SessionRevocationsOrm.__name__}, {len(rows)} entries retrieved',
+        )
+
+    def to_schema(self) -> RevocationListSchema:
+        """Список отзывов для проверки токенов на фронтенде."""
+        return RevocationListSchema(sessions=sorted(self._sessions), users=self._users)
+
+
+revocation_list = RevocationList()
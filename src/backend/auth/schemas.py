@@ -1,5 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 
+from users.schemas import RoleReadSchema
+
 
 class SessionInSchema(BaseModel):
     """Класс получения номера сессии на вход."""
@@ -22,3 +24,24 @@ class SessionCreateSchema(BaseModel):
     user_id: int
 
     model_config = ConfigDict(extra='ignore')
+
+
+class SessionTokenSchema(BaseModel):
+    """Класс содержимого подписанного токена сессии."""
+
+    sid: str
+    user_id: int
+    username: str
+    role: RoleReadSchema
+    # Время выпуска и окончания действия, секунды unix; iat с долями секунды,
+    # как и момент отзыва revoked_at, иначе токен, выпущенный в ту же секунду после отзыва, считается отозванным
+    iat: float
+    exp: int
+
+
+class RevocationListSchema(BaseModel):
+    """Класс списка отозванных токенов сессий."""
+
+    sessions: list[str]
+    # id пользователя -> токены, выпущенные не позже этого момента (секунды unix), отозваны
+    users: dict[int, float]
@@ -1,17 +1,26 @@
+import time
+from datetime import datetime
+
 from fastapi import HTTPException, status
-from sqlalchemy import delete
+from loguru import logger
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from auth.cache import session_cache
 from auth.constants import (
+    AUTH_SESSION_MODE_TOKEN,
     ERROR_MESSAGE_WRONG_LOGIN_DATA,
 )
 from auth.models import SessionsOrm
-from auth.schemas import SessionCreateSchema, SessionInSchema
+from auth.revocation import revocation_list
+from auth.schemas import SessionCreateSchema, SessionInSchema, SessionReadSchema
+from auth.tokens import create_session_token, verify_session_token
 from auth.utils import verify_password
 from base_service import BaseService
+from config import settings
 from users.models import UsersOrm
-from users.schemas import UserLoginSchema
-from users.service import user_service
+from users.schemas import UserLoginSchema, UserReadSchema
+from users.service import USER_READ_OPTIONS, USER_ROLE_OPTIONS, user_service
 
 
 class SessionService(BaseService):
@@ -20,10 +29,10 @@ class SessionService(BaseService):
 
     async def user_login(
         self, session: AsyncSession, login_schema: UserLoginSchema
-    ) -> SessionsOrm:
+    ) -> SessionsOrm | SessionReadSchema:
         """Аутентифицируем пользователя по имени и паролю."""
         user: UsersOrm | None = await user_service.get_user_by_username(
-            session, login_schema.username
+            session, login_schema.username, options=USER_ROLE_OPTIONS
         )
 
         # Пользователя нет, он неактивен или введен неверный пароль...
@@ -37,6 +46,10 @@ class SessionService(BaseService):
                 detail=ERROR_MESSAGE_WRONG_LOGIN_DATA,
             )
 
+        # Подписанный токен и есть номер сессии, в БД ничего не пишем
+        if settings.AUTH_SESSION_MODE == AUTH_SESSION_MODE_TOKEN:
+            return SessionReadSchema(id=create_session_token(user), user_id=user.id)
+
         user_session_schema = SessionCreateSchema(user_id=user.id)
         user_session = await session_service.create(session, user_session_schema)
         return user_session
@@ -45,22 +58,89 @@ class SessionService(BaseService):
         self,
         session: AsyncSession,
         user_session_provided: SessionInSchema,
-    ) -> UsersOrm:
-        """Получаем пользователя по сессии."""
-        user_session: SessionsOrm | None = await session_service.get(
-            session, user_session_provided.id
+    ) -> UserReadSchema:
+        """Получаем пользователя по сессии: из кэша или одним запросом к БД."""
+        if settings.AUTH_SESSION_MODE == AUTH_SESSION_MODE_TOKEN:
+            return await self._get_user_by_token(session, user_session_provided.id)
+
+        user: UserReadSchema | None = session_cache.get(user_session_provided.id)
+        if user is not None:
+            return user
+
+        # Сессия должна быть действующей, а пользователь - активным
+        query = (
+            select(UsersOrm, SessionsOrm.expired_at)
+            .join(SessionsOrm, SessionsOrm.user_id == UsersOrm.id)
+            .where(
+                SessionsOrm.id == user_session_provided.id,
+                SessionsOrm.expired_at > func.now(),
+                UsersOrm.is_active == True,  # noqa: E712
+            )
+            .options(*USER_READ_OPTIONS)
+        )
+        row = (await session.execute(query)).first()
+        logger.log(
+            'DB_ACCESS',
+            f'Entry retrieve: model={SessionsOrm.__name__}, result={"success" if row else "not found"}',
+        )
+
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=ERROR_MESSAGE_WRONG_LOGIN_DATA,
+            )
+
+        user = UserReadSchema.model_validate(row.UsersOrm)
+        session_cache.set(
+            user_session_provided.id, user, (row.expired_at - datetime.now()).total_seconds()
         )
+        return user
 
-        if not user_session or not user_session.user.is_active:
+    async def _get_user_by_token(
+        self,
+        session: AsyncSession,
+        token: str,
+    ) -> UserReadSchema:
+        """Получаем пользователя по подписанному токену, отозванные токены отклоняем."""
+        token_schema = verify_session_token(token)
+        if token_schema is None or revocation_list.is_revoked(token_schema):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=ERROR_MESSAGE_WRONG_LOGIN_DATA,
+            )
+
+        user: UserReadSchema | None = session_cache.get(token)
+        if user is not None:
+            return user
+
+        # Полные данные пользователя нужны только этому эндпоинту, фронтенд проверяет токен сам
+        user_orm: UsersOrm | None = await user_service.get(session, token_schema.user_id)
+        if user_orm is None or not user_orm.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=ERROR_MESSAGE_WRONG_LOGIN_DATA,
             )
 
-        # Тут какой-то нюанс жадной загрузки, объект user_session.user неполноценный, приходится отдельным запросом доставать
-        user: UsersOrm | None = await user_service.get(session, user_session.user.id)
+        user = UserReadSchema.model_validate(user_orm)
+        session_cache.set(token, user, token_schema.exp - time.time())
         return user
 
+    async def delete_session(
+        self,
+        session: AsyncSession,
+        session_id: str,
+    ) -> None:
+        """Удаляем сессию (выход пользователя) вместе с записью в кэше."""
+        session_cache.invalidate(session_id)
+
+        if settings.AUTH_SESSION_MODE == AUTH_SESSION_MODE_TOKEN:
+            token_schema = verify_session_token(session_id)
+            if token_schema is not None:
+                await revocation_list.revoke_session(session, token_schema)
+            return
+
+        await self.delete(session, session_id)
+
     async def delete_sessions_by_user(
         self,
         session: AsyncSession,
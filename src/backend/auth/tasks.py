@@ -6,9 +6,17 @@ from fastapi import FastAPI
 from loguru import logger
 from sqlalchemy import delete, or_
 
-from auth.constants import SESSION_CLEANUP_FREQ_IN_HOURS
-from auth.models import SessionsOrm
+from auth.constants import (
+    AUTH_SESSION_MODE_TOKEN,
+    REVOCATION_SYNC_FREQ_IN_SECONDS,
+    SESSION_CLEANUP_FREQ_IN_HOURS,
+)
+from auth.models import SessionRevocationsOrm, SessionsOrm
+from auth.revocation import revocation_list
+from config import settings
 from database import AsyncSessionLocal
+from messages.delivery import delivery_service
+from messages.outbox import outbox_dispatcher
 
 
 async def cleanup_sessions_task():
@@ -23,6 +31,10 @@ async def cleanup_sessions_task():
                     )
                 )
                 await session.execute(stmt)
+                # Отзывы старше срока действия токенов больше ничего не отзывают
+                await session.execute(
+                    delete(SessionRevocationsOrm).where(SessionRevocationsOrm.expired_at < datetime.now())
+                )
                 await session.commit()
                 logger.log(
                     'DB_ACCESS',
@@ -37,10 +49,37 @@ async def cleanup_sessions_task():
             await asyncio.sleep(SESSION_CLEANUP_FREQ_IN_HOURS * 60 * 60)
 
 
+async def sync_revocations_task():
+    """Подгружаем отзывы токенов, сделанные другими процессами бэкенда."""
+    while True:
+        async with AsyncSessionLocal() as session:
+            try:
+                await revocation_list.sync(session)
+            except Exception as e:
+                logger.log(
+                    'DB_ACCESS',
+                    f'Data retrieve: model={SessionRevocationsOrm.__name__}, error: {e}',
+                )
+
+        await asyncio.sleep(REVOCATION_SYNC_FREQ_IN_SECONDS)
+
+
 @asynccontextmanager
 async def lifespan_tasks(app: FastAPI):
     task = asyncio.create_task(cleanup_sessions_task())
+    sync_task = (
+        asyncio.create_task(sync_revocations_task())
+        if settings.AUTH_SESSION_MODE == AUTH_SESSION_MODE_TOKEN
+        else None
+    )
+    await delivery_service.start()
+    outbox_dispatcher.start()
     try:
         yield
     finally:
         task.cancel()
+        if sync_task is not None:
+            sync_task.cancel()
+        # Сначала фиксируем результаты текущей пачки, потом закрываем доставку
+        await outbox_dispatcher.stop()
+        await delivery_service.stop()
@@ -0,0 +1,61 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+from pydantic import ValidationError
+
+from auth.constants import SESSION_DURATION_IN_DAYS
+from auth.schemas import SessionTokenSchema
+from auth.utils import create_random_session_string
+from config import settings
+from users.models import UsersOrm
+from users.schemas import RoleReadSchema
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    """Подпись HMAC-SHA256 общим с фронтендом секретом."""
+    digest = hmac.new(settings.AUTH_TOKEN_SECRET.encode(), payload.encode('ascii'), hashlib.sha256).digest()
+    return _b64encode(digest)
+
+
+def create_session_token(user: UsersOrm) -> str:
+    """Выпускаем подписанный токен сессии; роль пользователя должна быть загружена."""
+    # С пустым ключом подпись может подделать кто угодно
+    if not settings.AUTH_TOKEN_SECRET:
+        raise RuntimeError('HRBOT_AUTH_TOKEN_SECRET is required for token sessions')
+
+    now = time.time()
+    token = SessionTokenSchema(
+        sid=create_random_session_string(),
+        user_id=user.id,
+        username=user.username,
+        role=RoleReadSchema.model_validate(user.role, from_attributes=True),
+        iat=now,
+        exp=int(now) + SESSION_DURATION_IN_DAYS * 24 * 60 * 60,
+    )
+    payload = _b64encode(token.model_dump_json().encode())
+    return f'{payload}.{_sign(payload)}'
+
+
+def verify_session_token(token: str) -> SessionTokenSchema | None:
+    """Проверяем подпись и срок действия токена, без обращения к БД."""
+    payload, _, signature = token.partition('.')
+    if not settings.AUTH_TOKEN_SECRET or not payload or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+
+    try:
+        token_schema = SessionTokenSchema.model_validate(json.loads(_b64decode(payload)))
+    except (ValueError, ValidationError):
+        return None
+
+    return token_schema if token_schema.exp > time.time() else None
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from auth.revocation import revocation_list
 from auth.schemas import (
+    RevocationListSchema,
     SessionInSchema,
     SessionReadSchema,
 )
@@ -29,6 +31,16 @@ async def create_session(
     return user_session
 
 
+@auth_router.get(
+    '/revoked',
+    response_model=RevocationListSchema,
+    summary='Получение списка отозванных токенов сессий',
+)
+async def get_revoked_sessions() -> RevocationListSchema:
+    """Эндпоинт списка отзывов для проверки подписанных токенов на фронтенде."""
+    return revocation_list.to_schema()
+
+
 @auth_router.get(
     '/{session_id}',
     response_model=UserReadSchema,
@@ -51,4 +63,4 @@ async def delete_session(
     session_id: str, session: AsyncSession = Depends(get_async_session)
 ) -> None:
     """Эндпоинт получения пользователя по сессии."""
-    await session_service.delete(session, session_id)
+    await session_service.delete_session(session, session_id)
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+
+
+class UploadRowErrorSchema(BaseModel):
+    """Класс ошибки в строке загружаемого файла."""
+    row: int
+    message: str
+
+
+class UploadReportSchema(BaseModel):
+    """Класс отчета о загрузке данных из файла."""
+    filepath: str
+    total_rows: int = 0
+    loaded_rows: int = 0
+    errors: list[UploadRowErrorSchema] = []
+
+    @property
+    def is_success(self) -> bool:
+        """Файл загружен целиком, без ошибок."""
+        return not self.errors
+
+    def summary(self) -> str:
+        """Краткое описание результата для пользователя."""
+        if self.is_success:
+            return f'Загружено строк: {self.loaded_rows}'
+        first_errors = '; '.join(f'строка {el.row}: {el.message}' for el in self.errors[:3])
+        return f'Файл не загружен, ошибок: {len(self.errors)}. {first_errors}'
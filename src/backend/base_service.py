@@ -1,15 +1,36 @@
-from typing import Any
+import csv
+import io
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Sequence
 
+import aiofiles
+from fastapi import HTTPException, status
 from pydantic import BaseModel, ValidationError
-from sqlalchemy import delete, select
+from sqlalchemy import Select, column, delete, insert, inspect, select, table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.interfaces import LoaderOption
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import TableClause
 
+from base_schemas import UploadReportSchema, UploadRowErrorSchema
+from config import settings
+from database import AsyncSessionLocal
 from log import logger
-from utils import read_csv, write_csv
+from snapshots.constants import ERROR_MESSAGE_SNAPSHOT_NOT_FOUND, SNAPSHOTS_KEEP_PER_TABLE
+from snapshots.models import DataSnapshotOrm
+from snapshots.schemas import SnapshotReadSchema
+from utils import read_csv_chunks
 
 
 class BaseService:
-    """Базовый класс сервисных методов обращения в БД."""
+    """Базовый класс сервисных методов обращения в БД.
+
+    Связи моделей не загружаются неявно (lazy='raise'). В loader_options сервис
+    указывает связи, нужные для его схем чтения; методы чтения принимают options,
+    когда вызывающему нужен другой набор связей.
+    """
+    loader_options: Sequence[LoaderOption] = ()
+
     def __init__(self, model):
         """Инициализация объекта класса."""
         self.model = model
@@ -18,9 +39,14 @@ class BaseService:
         self,
         session: AsyncSession,
         obj_id: int,
+        options: Sequence[LoaderOption] | None = None,
     ) -> Any | None:
         """Функция чтения единичной записи таблицы."""
-        query = select(self.model).where(self.model.id == obj_id)
+        query = (
+            select(self.model)
+            .where(self.model.id == obj_id)
+            .options(*(self.loader_options if options is None else options))
+        )
         db_obj = await session.execute(query)
         db_obj = db_obj.scalars().first()
 
@@ -35,9 +61,14 @@ class BaseService:
     async def get_all(
         self,
         session: AsyncSession,
+        options: Sequence[LoaderOption] | None = None,
     ) -> list:
         """Метод чтения всех записей таблицы."""
-        query = select(self.model).order_by(*self.model.__order_by__)
+        query = (
+            select(self.model)
+            .options(*(self.loader_options if options is None else options))
+            .order_by(*self.model.__order_by__)
+        )
         result = await session.execute(query)
         result = result.scalars().all()
         logger.log(
@@ -50,7 +81,7 @@ class BaseService:
         new_db_obj = self.model(**data_input.model_dump())
         session.add(new_db_obj)
         await session.commit()
-        await session.refresh(new_db_obj)
+        new_db_obj = await self._reload(session, new_db_obj)
         logger.log(
             'DB_ACCESS',
             f'Entry creation: model={new_db_obj.__class__.__name__}, id={new_db_obj.id}',
@@ -63,13 +94,23 @@ class BaseService:
 
         session.add(db_obj)
         await session.commit()
-        await session.refresh(db_obj)
+        db_obj = await self._reload(session, db_obj)
         logger.log(
             'DB_ACCESS',
             f'Entry update: model={db_obj.__class__.__name__}, id={db_obj.id}',
         )
         return db_obj
 
+    async def _reload(self, session: AsyncSession, db_obj: Any) -> Any:
+        """Перечитываем запись после коммита вместе со связями из loader_options."""
+        # После коммита атрибуты устарели, ключ берем из identity map без обращения к БД
+        return await session.get(
+            self.model,
+            inspect(db_obj).identity,
+            options=self.loader_options,
+            populate_existing=True,
+        )
+
     async def delete(
         self,
         session: AsyncSession,
@@ -100,62 +141,237 @@ class BaseService:
         filepath: str,
         pydantic_model: type[BaseModel],
         created_by_id: int = None,
-    ) -> None:
-        """Загружаем данные в таблицу БД, делая предварительно копию."""
-        # Сначала делаем бэкап и потом затираем текущие данные в таблице БД
+    ) -> UploadReportSchema:
+        """Загружаем данные в таблицу БД, делая предварительно копию.
+
+        Файл читается и проверяется частями и загружается в промежуточную таблицу.
+        Затем в одной транзакции снимаем копию текущих данных и подменяем их новыми:
+        читатели видят либо старый, либо новый набор данных. При любой ошибке
+        транзакция откатывается, а отчет содержит ошибки по каждой строке.
+        """
+        report = UploadReportSchema(filepath=filepath)
+        table_name = self.model.__tablename__
+        staging_name = f'{table_name}_staging'
+
+        # Если в модели есть поля с авторами, то дообогащаем данные
+        author_fields = [
+            attr for attr in ('created_by_id', 'updated_by_id') if attr in pydantic_model.model_fields
+        ]
+
         try:
-            backup_filepath = filepath[: filepath.rfind('.csv')] + '_backup.csv'
-            await self.download_data(session, backup_filepath)
+            # Промежуточная таблица повторяет структуру основной, включая уникальные индексы
+            await session.execute(text(
+                f'CREATE TEMP TABLE {staging_name} '
+                f'(LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES) '
+                f'ON COMMIT DROP'
+            ))
+            staging = table(staging_name, *[column(c.name, c.type) for c in self.model.__table__.columns])
+
+            # Первая строка файла - заголовок
+            row_number = 1
+            async for chunk in read_csv_chunks(filepath, settings.UPLOAD_CHUNK_SIZE):
+                rows: list[tuple[int, dict]] = []
+                for el in chunk:
+                    row_number += 1
+                    for attr in author_fields:
+                        el[attr] = created_by_id
+                    try:
+                        rows.append((row_number, pydantic_model.model_validate(el).model_dump()))
+                    except ValidationError as e:
+                        self._report_error(report, row_number, e.errors()[0]['msg'])
+
+                report.total_rows = row_number - 1
+                # После первой ошибки файл не загрузится, только собираем отчет
+                if rows and report.is_success:
+                    await self._insert_chunk(session, staging, rows, report)
+
+            if report.is_success:
+                await self._create_snapshot(session)
+                # Подмена данных: до коммита читатели видят старый набор
+                columns = [c.name for c in self.model.__table__.columns]
+                await session.execute(delete(self.model))
+                await session.execute(
+                    insert(self.model).from_select(columns, select(*[staging.c[name] for name in columns]))
+                )
         except Exception as e:
-            logger.error(f'❌ Error while creating backup. Error text: {e}')
-            return
+            logger.error(f'❌ Error while uploading {filepath}. Error text: {e}')
+            self._report_error(report, 0, str(e))
+
+        if not report.is_success:
+            await session.rollback()
+            logger.error(
+                f'❌ The data from {filepath} was not uploaded to {self.model.__name__}, '
+                f'{len(report.errors)} errors found'
+            )
+            return report
 
+        await session.commit()
+        report.loaded_rows = report.total_rows
         logger.info(
-            f'⚠️  The data of {self.model.__name__} was backed up to the file {backup_filepath}'
+            f'✅ The data from {filepath} was uploaded to {self.model.__name__} DB table, {report.loaded_rows} rows in total'
         )
-        await self.delete_all(session)
-        logger.info(f'⚠️  The data of {self.model.__name__} was deleted')
+        return report
 
-        data: list[dict] = await read_csv(filepath)
+    async def restore_data(self, session: AsyncSession) -> SnapshotReadSchema:
+        """Восстанавливаем данные таблицы из последней копии в одной транзакции.
 
-        # Если в модели есть поля с авторами, то дообогащаем данные
-        for attr in ('created_by_id', 'updated_by_id'):
-            if attr in pydantic_model.model_fields:
-                for el in data:
-                    el[attr] = created_by_id
+        Перед восстановлением текущие данные сохраняются в новую копию, поэтому
+        повторное восстановление возвращает таблицу к состоянию до отмены.
+        """
+        table_name = self.model.__tablename__
+        query = (
+            select(DataSnapshotOrm)
+            .where(DataSnapshotOrm.table_name == table_name)
+            .order_by(DataSnapshotOrm.id.desc())
+            .limit(1)
+        )
+        snapshot: DataSnapshotOrm | None = (await session.execute(query)).scalars().first()
 
-        try:
-            data = [pydantic_model.model_validate(el) for el in data]
-        except ValidationError as e:
-            logger.error(f'❌ Error while creating Pydantic model. Error text: {e}')
-            return
+        if snapshot is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=ERROR_MESSAGE_SNAPSHOT_NOT_FOUND,
+            )
+        snapshot_schema = SnapshotReadSchema.model_validate(snapshot)
 
-        for el in data:
-            await self.create(session, el)
+        try:
+            # Текущие данные тоже сохраняем в копию, чтобы восстановление можно было отменить.
+            # Копия, из которой восстанавливаем, при очистке старых копий сохраняется: она вторая по свежести
+            await self._create_snapshot(session)
+            await session.execute(delete(self.model))
+            await session.execute(
+                text(
+                    f'INSERT INTO {table_name} SELECT * FROM jsonb_populate_recordset('
+                    f'NULL::{table_name}, (SELECT payload FROM data_snapshot WHERE id = :snapshot_id))'
+                ),
+                {'snapshot_id': snapshot_schema.id},
+            )
+            # Восстановленные id не должны конфликтовать с новыми записями
+            await session.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+                    f'coalesce(max(id), 1), max(id) IS NOT NULL) FROM {table_name}'
+                )
+            )
+            await session.commit()
+        except DBAPIError as e:
+            await session.rollback()
+            logger.error(f'❌ Error while restoring {self.model.__name__}. Error text: {e}')
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e.orig).splitlines()[-1],
+            )
 
         logger.info(
-            f'✅ The data from {filepath} was uploaded to {self.model.__name__} DB table, {len(data)} rows in total'
+            f'✅ The data of {self.model.__name__} was restored from snapshot id={snapshot_schema.id}, '
+            f'{snapshot_schema.rows_count} rows in total'
         )
+        return snapshot_schema
 
-    async def download_data(self, session: AsyncSession, filepath: str) -> None:
-        """Выгружаем данные в csv-файл."""
-        entries = await self.get_all(session)
+    async def _create_snapshot(self, session: AsyncSession) -> None:
+        """Снимаем копию текущих данных таблицы в той же транзакции, храним последние копии."""
+        table_name = self.model.__tablename__
+        await session.execute(
+            text(
+                f'INSERT INTO data_snapshot (table_name, payload, rows_count) '
+                f"SELECT :table_name, coalesce(jsonb_agg(to_jsonb(t) ORDER BY t.id), '[]'::jsonb), count(*) "
+                f'FROM {table_name} t'
+            ),
+            {'table_name': table_name},
+        )
+
+        latest = (
+            select(DataSnapshotOrm.id)
+            .where(DataSnapshotOrm.table_name == table_name)
+            .order_by(DataSnapshotOrm.id.desc())
+            .limit(SNAPSHOTS_KEEP_PER_TABLE)
+        )
+        await session.execute(
+            delete(DataSnapshotOrm).where(
+                DataSnapshotOrm.table_name == table_name,
+                DataSnapshotOrm.id.not_in(latest.scalar_subquery()),
+            )
+        )
+        logger.info(f'⚠️  The data of {self.model.__name__} was saved to snapshot')
 
-        if len(entries) == 0:
-            logger.info(
-                f'⚠️ Attempt to backup {self.model.__name__}. Table is empty. Proceed.')
+    async def _insert_chunk(
+        self,
+        session: AsyncSession,
+        target: TableClause,
+        rows: list[tuple[int, dict]],
+        report: UploadReportSchema,
+    ) -> None:
+        """Вставляем пачку строк одним executemany, при ошибке ищем виновные строки."""
+        try:
+            async with session.begin_nested():
+                await session.execute(insert(target), [data for _, data in rows])
             return
+        except DBAPIError:
+            pass
 
-        if hasattr(self.model, 'to_dict'):
-            headers = entries[0].to_dict().keys()
-            entries: list[dict] = [
-                headers,
-            ] + [el.to_dict().values() for el in entries]
+        # Пачка не вставилась - повторяем построчно, чтобы указать в отчете конкретные строки
+        for row_number, data in rows:
+            try:
+                async with session.begin_nested():
+                    await session.execute(insert(target), [data])
+            except DBAPIError as e:
+                self._report_error(report, row_number, str(e.orig).splitlines()[-1])
+
+    @staticmethod
+    def _report_error(report: UploadReportSchema, row_number: int, message: str) -> None:
+        """Добавляем ошибку в отчет, ограничивая его размер."""
+        if len(report.errors) < settings.UPLOAD_MAX_REPORTED_ERRORS:
+            report.errors.append(UploadRowErrorSchema(row=row_number, message=message))
+
+    async def stream_csv(
+        self,
+        query: Select | None = None,
+        session: AsyncSession | None = None,
+    ) -> AsyncIterator[str]:
+        """Выгружаем данные в CSV частями через курсор на стороне сервера.
 
-            await write_csv(entries, filepath)
-            logger.info(
-                f'✅ The data of {self.model.__name__} was downloaded to the file {filepath}')
-        else:
+        Память не зависит от размера таблицы. Без переданной сессии открываем
+        собственную: StreamingResponse читает генератор уже после завершения запроса.
+        """
+        if query is None:
+            query = select(self.model).order_by(*self.model.__order_by__)
+        query = query.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=';')
+        rows_count = 0
+
+        # BOM, как и у utf-8-sig, чтобы Excel правильно определял кодировку
+        yield '\ufeff'
+        async with nullcontext(session) if session else AsyncSessionLocal() as db_session:
+            result = await db_session.stream_scalars(query)
+            async for partition in result.partitions():
+                for el in partition:
+                    row: dict = el.to_dict()
+                    if rows_count == 0:
+                        writer.writerow(row.keys())
+                    writer.writerow(row.values())
+                    rows_count += 1
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        logger.log(
+            'DB_ACCESS',
+            f'Data export: model={self.model.__name__}, {rows_count} entries streamed',
+        )
+
+    async def download_data(self, session: AsyncSession, filepath: str) -> None:
+        """Выгружаем данные в csv-файл."""
+        if not hasattr(self.model, 'to_dict'):
             logger.warning(
                 f'❌ Error while downloading data of {self.model.__name__}. Model has to have to_dict method'
             )
+            return
+
+        async with aiofiles.open(filepath, mode='w', encoding='utf-8', newline='') as csvfile:
+            async for chunk in self.stream_csv(session=session):
+                await csvfile.write(chunk)
+
+        logger.info(
+            f'✅ The data of {self.model.__name__} was downloaded to the file {filepath}')
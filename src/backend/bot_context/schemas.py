@@ -0,0 +1,18 @@
+from fastapi_pagination import Page
+from pydantic import BaseModel
+
+from menu.schemas import MenuItemShortSchema
+from messages.schemas import EmployeeReadSchema
+
+
+class BotContextRequestSchema(BaseModel):
+    """Класс запроса контекста бота для сотрудника."""
+    name: str | None = None
+
+
+class BotContextSchema(BaseModel):
+    """Класс контекста бота: сотрудник, версии настроек и справочника, первая страница меню."""
+    employee: EmployeeReadSchema
+    settings_version: str
+    menu_version: str
+    menu_page: Page[MenuItemShortSchema]
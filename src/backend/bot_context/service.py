@@ -0,0 +1,37 @@
+from fastapi_pagination import Params
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot_context.schemas import BotContextRequestSchema, BotContextSchema
+from bot_settings.service import bot_settings_service
+from menu.service import menu_service
+from messages.schemas import EmployeeCreareSchema
+from messages.service import employee_service
+
+
+class BotContextService:
+    """Класс сборки контекста бота из данных нескольких сервисов."""
+
+    async def get_bot_context(
+        self,
+        session: AsyncSession,
+        employee_id: int,
+        data_input: BotContextRequestSchema,
+        page_params: Params,
+    ) -> BotContextSchema:
+        """Собираем контекст бота в рамках одной сессии БД."""
+        employee = await employee_service.upsert_employee(
+            session, EmployeeCreareSchema(id=employee_id, name=data_input.name)
+        )
+        settings_version = await bot_settings_service.get_settings_version(session)
+        menu_version = await menu_service.get_menu_version(session)
+        menu_page = await menu_service.get_menu_short_page(session, page_params)
+
+        return BotContextSchema(
+            employee=employee,
+            settings_version=settings_version,
+            menu_version=menu_version,
+            menu_page=menu_page.model_dump(),
+        )
+
+
+bot_context_service = BotContextService()
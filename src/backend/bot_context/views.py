@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from fastapi_pagination import Params
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot_context.schemas import BotContextRequestSchema, BotContextSchema
+from bot_context.service import bot_context_service
+from database import get_async_session
+
+bot_context_router = APIRouter()
+
+
+@bot_context_router.post(
+    '/{employee_id}',
+    response_model=BotContextSchema,
+    summary='Получить контекст бота для сотрудника',
+)
+async def get_bot_context(
+    employee_id: int,
+    data_input: BotContextRequestSchema,
+    page_params: Params = Depends(),
+    session: AsyncSession = Depends(get_async_session),
+) -> BotContextSchema:
+    """Эндпоинт получения сотрудника, версий настроек и справочника и первой страницы меню одним запросом."""
+    bot_context = await bot_context_service.get_bot_context(
+        session, employee_id, data_input, page_params
+    )
+    return bot_context
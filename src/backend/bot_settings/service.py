@@ -1,4 +1,6 @@
 from fastapi import HTTPException, status
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from base_service import BaseService
@@ -35,6 +37,29 @@ class BotSettingsService(BaseService):
                     detail=ERROR_MESSAGE_VALUE_INT,
                 )
 
+    async def get_settings_version(
+        self,
+        session: AsyncSession,
+    ) -> str:
+        """Получаем версию настроек - хэш содержимого таблицы, считается на стороне БД."""
+        row = func.concat_ws(
+            '|',
+            BotSettingsOrm.id,
+            BotSettingsOrm.name,
+            BotSettingsOrm.value,
+            BotSettingsOrm.int_type,
+        )
+        query = select(
+            func.md5(
+                func.coalesce(
+                    func.string_agg(row, aggregate_order_by(literal('\n'), BotSettingsOrm.id)),
+                    '',
+                )
+            )
+        )
+        result = await session.execute(query)
+        return result.scalar_one()
+
     async def get_setting(
         self,
         session: AsyncSession,
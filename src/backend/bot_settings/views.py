@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from base_schemas import UploadReportSchema
 from bot_settings.models import BotSettingsOrm
 from bot_settings.schemas import (
     SettingCreateSchema,
@@ -9,7 +11,9 @@ from bot_settings.schemas import (
 )
 from bot_settings.service import bot_settings_service
 from config import settings as s
-from database import get_async_session
+from database import get_async_read_session, get_async_session
+from snapshots.schemas import SnapshotReadSchema
+from utils import csv_streaming_response, etag_matches, upload_report_response
 
 botsettings_router = APIRouter()
 
@@ -17,22 +21,42 @@ botsettings_router = APIRouter()
 @botsettings_router.get(
     '/',
     response_model=list[SettingsReadSchema],
+    responses={status.HTTP_304_NOT_MODIFIED: {'description': 'Настройки не изменились'}},
     summary='Получить список настроек проекта',
 )
 async def get_settings(
-    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> list[SettingsReadSchema]:
-    """Эндпоинт получения всех настроек проекта."""
+    """Эндпоинт получения всех настроек проекта с поддержкой ETag."""
+    etag = f'"{await bot_settings_service.get_settings_version(session)}"'
+
+    # Клиент уже держит актуальную версию - таблицу не читаем
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    response.headers['ETag'] = etag
     settings = await bot_settings_service.get_all(session)
     return settings
 
 
+@botsettings_router.get(
+    '/export',
+    response_class=StreamingResponse,
+    summary='Выгрузить настройки проекта в CSV',
+)
+async def export_settings() -> StreamingResponse:
+    """Эндпоинт потоковой выгрузки настроек проекта в CSV."""
+    return csv_streaming_response(bot_settings_service.stream_csv(), 'settings.csv')
+
+
 @botsettings_router.get(
     '/{setting_id}', response_model=SettingsReadSchema, summary='Получить настройку проекта'
 )
 async def get_one_setting(
     setting_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> SettingsReadSchema:
     """Эндпоинт получения одной настройки проекта."""
     setting: BotSettingsOrm | None = await bot_settings_service.get_setting(session, setting_id)
@@ -63,12 +87,29 @@ async def download_settings(
 
 
 @botsettings_router.post(
-    '/upload', response_model=None, summary='Загрузить настройки проекта из файла'
+    '/upload',
+    response_model=UploadReportSchema,
+    responses={status.HTTP_422_UNPROCESSABLE_ENTITY: {'description': 'Файл содержит ошибки, данные не изменены'}},
+    summary='Загрузить настройки проекта из файла',
 )
 async def upload_settings(
     session: AsyncSession = Depends(get_async_session),
-) -> None:
+) -> UploadReportSchema:
     """Эндпоинт загрузки настроек из файла."""
-    await bot_settings_service.upload_data(
+    report: UploadReportSchema = await bot_settings_service.upload_data(
         session, s.FIXTURES_SETTINGS_PATH, SettingCreateSchema
     )
+    return upload_report_response(report)
+
+
+@botsettings_router.post(
+    '/restore',
+    response_model=SnapshotReadSchema,
+    summary='Восстановить настройки проекта из последней копии',
+)
+async def restore_settings(
+    session: AsyncSession = Depends(get_async_session),
+) -> SnapshotReadSchema:
+    """Эндпоинт восстановления настроек из копии, снятой перед последней загрузкой."""
+    snapshot: SnapshotReadSchema = await bot_settings_service.restore_data(session)
+    return snapshot
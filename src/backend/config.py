@@ -21,11 +21,43 @@ class Settings(BaseSettings):
         f'{os.getenv('HRBOT_POSTGRES_DB_HOST')}:{os.getenv('HRBOT_POSTGRES_DB_PORT')}/'
         f'{os.getenv('HRBOT_POSTGRES_DB')}'
     )
+    # Реплика для эндпоинтов чтения, по умолчанию - та же БД
+    DATABASE_REPLICA_URL: str = (
+        f'postgresql+asyncpg://'
+        f'{os.getenv('HRBOT_POSTGRES_USER')}:'
+        f'{os.getenv('HRBOT_POSTGRES_PASSWORD')}@'
+        f'{os.getenv('HRBOT_POSTGRES_REPLICA_HOST', os.getenv('HRBOT_POSTGRES_DB_HOST'))}:'
+        f'{os.getenv('HRBOT_POSTGRES_REPLICA_PORT', os.getenv('HRBOT_POSTGRES_DB_PORT'))}/'
+        f'{os.getenv('HRBOT_POSTGRES_DB')}'
+    )
+    # После записи чтение идет в основную БД, пока реплика может отставать
+    DB_READ_YOUR_WRITES_IN_SECONDS: int = os.getenv('HRBOT_DB_READ_YOUR_WRITES_IN_SECONDS', 5)
+    # Пул соединений и параметры драйвера asyncpg
+    DB_POOL_SIZE: int = os.getenv('HRBOT_DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW: int = os.getenv('HRBOT_DB_MAX_OVERFLOW', 10)
+    DB_POOL_TIMEOUT: int = os.getenv('HRBOT_DB_POOL_TIMEOUT', 30)
+    DB_POOL_RECYCLE: int = os.getenv('HRBOT_DB_POOL_RECYCLE', 1800)
+    DB_POOL_PRE_PING: bool = os.getenv('HRBOT_DB_POOL_PRE_PING', 'True').lower() in ('true', '1')
+    DB_STATEMENT_CACHE_SIZE: int = os.getenv('HRBOT_DB_STATEMENT_CACHE_SIZE', 100)
+    DB_STATEMENT_TIMEOUT_MS: int = os.getenv('HRBOT_DB_STATEMENT_TIMEOUT_MS', 30000)
+    # Подключение через PgBouncer в режиме transaction: без кэша подготовленных выражений
+    DB_PGBOUNCER: bool = os.getenv('HRBOT_DB_PGBOUNCER', 'False').lower() in ('true', '1')
+    DB_APPLICATION_NAME: str = 'hrbot_backend'
+
+    # Сессии админки: 'db' - записи в таблице сессий, 'token' - подписанные токены без обращения к БД
+    AUTH_SESSION_MODE: str = os.getenv('HRBOT_AUTH_SESSION_MODE', 'db')
+    AUTH_TOKEN_SECRET: str = os.getenv('HRBOT_AUTH_TOKEN_SECRET', '')
+
+    # Число процессов бэкенда (воркеры × реплики): лимиты отправки в Telegram делятся между ними
+    BACKEND_PROCESSES: int = os.getenv('HRBOT_BACKEND_PROCESSES', 1)
     TELEGRAM_API_URL: str = os.getenv('HRBOT_TELEGRAM_API_URL', '')
     TELEGRAM_BOT_TOKEN: str = os.getenv('HRBOT_TELEGRAM_BOT_TOKEN', '')
 
     FIXTURES_MENU_PATH: str = 'fixtures/menu.csv'
     FIXTURES_SETTINGS_PATH: str = 'fixtures/settings.csv'
+    UPLOAD_CHUNK_SIZE: int = 1000
+    UPLOAD_MAX_REPORTED_ERRORS: int = 100
+    EXPORT_CHUNK_SIZE: int = 1000
 
     OPENAPI_URL: str = '/bot/api/openapi.json'
     DOCS_URL: str = '/bot/api/docs'
@@ -1,6 +1,11 @@
-from sqlalchemy import Integer
+import time
+from typing import Callable
+from uuid import uuid4
+
+from fastapi import Request, Response
+from sqlalchemy import Integer, event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import Mapped, declarative_base, declared_attr, mapped_column
+from sqlalchemy.orm import Mapped, ORMExecuteState, Session, declarative_base, declared_attr, mapped_column
 
 from config import settings
 from log import sql_logger  # noqa
@@ -24,13 +29,107 @@ class PreBase:
 
 AppBaseClass = declarative_base(cls=PreBase)
 
-engine = create_async_engine(
-    url=settings.DATABASE_URL, echo=False if settings.PROD_ENVIRONMENT else True
-)
+
+def get_engine_options() -> dict:
+    """Параметры движка: пул соединений и настройки драйвера asyncpg из Settings."""
+    connect_args = {
+        'server_settings': {'application_name': settings.DB_APPLICATION_NAME},
+    }
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer в режиме transaction отдает соединения разным клиентам:
+        # кэш подготовленных выражений отключаем, а имена делаем уникальными
+        connect_args['statement_cache_size'] = 0
+        connect_args['prepared_statement_cache_size'] = 0
+        connect_args['prepared_statement_name_func'] = lambda: f'__asyncpg_{uuid4()}__'
+    else:
+        connect_args['statement_cache_size'] = settings.DB_STATEMENT_CACHE_SIZE
+        connect_args['prepared_statement_cache_size'] = settings.DB_STATEMENT_CACHE_SIZE
+        # PgBouncer не принимает произвольные параметры при подключении, поэтому только напрямую
+        connect_args['server_settings']['statement_timeout'] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+
+    return {
+        'echo': False if settings.PROD_ENVIRONMENT else True,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+        'connect_args': connect_args,
+    }
+
+
+engine = create_async_engine(url=settings.DATABASE_URL, **get_engine_options())
+# Реплика для эндпоинтов чтения; локально может указывать на ту же БД
+replica_engine = create_async_engine(url=settings.DATABASE_REPLICA_URL, **get_engine_options())
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession)
+AsyncReadSessionLocal = async_sessionmaker(bind=replica_engine, class_=AsyncSession)
+
+# Кука с моментом последней записи клиента по time.time: пока она жива, чтения клиента идут в основную БД.
+# Кука передается клиентом, поэтому работает при любом числе воркеров бэкенда
+LAST_WRITE_COOKIE = 'hrbot_last_write'
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flush(session: Session, flush_context) -> None:  # noqa: ANN001
+    """Сессия записала изменения объектов ORM."""
+    session.info['has_writes'] = True
+
 
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_execute(orm_execute_state: ORMExecuteState) -> None:
+    """Сессия выполнила INSERT/UPDATE/DELETE запросом."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['has_writes'] = True
 
-async def get_async_session():
+
+async def get_async_session(request: Request):
     async with AsyncSessionLocal() as async_session:
+        # По сессии middleware узнает, записывал ли что-то запрос
+        request.state.db_session = async_session
+        yield async_session
+
+
+async def get_async_read_session(request: Request):
+    """Сессия для эндпоинтов только на чтение.
+
+    Читаем из реплики, но клиенту, который недавно записывал данные, - из основной БД,
+    чтобы его изменения были видны несмотря на отставание реплики.
+    """
+    try:
+        last_write_at = float(request.cookies.get(LAST_WRITE_COOKIE))
+    except (TypeError, ValueError):
+        last_write_at = 0.0
+    recent_write = time.time() - last_write_at < settings.DB_READ_YOUR_WRITES_IN_SECONDS
+    session_factory = AsyncSessionLocal if recent_write else AsyncReadSessionLocal
+    async with session_factory() as async_session:
         yield async_session
+
+
+async def read_your_writes_middleware(request: Request, call_next: Callable) -> Response:
+    """Запрос изменил данные - ставим клиенту куку с моментом записи."""
+    response: Response = await call_next(request)
+    db_session: AsyncSession | None = getattr(request.state, 'db_session', None)
+    if db_session is not None and db_session.sync_session.info.get('has_writes'):
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            str(time.time()),
+            max_age=settings.DB_READ_YOUR_WRITES_IN_SECONDS,
+            httponly=True,
+        )
+    return response
+
+
+def get_pool_stats(replica: bool = False) -> dict:
+    """Текущее состояние пула соединений основной БД или реплики для мониторинга."""
+    pool = replica_engine.pool if replica else engine.pool
+    return {
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'timeout': settings.DB_POOL_TIMEOUT,
+        'pgbouncer_mode': settings.DB_PGBOUNCER,
+    }
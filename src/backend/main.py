@@ -4,6 +4,7 @@ from fastapi.exceptions import RequestValidationError
 
 from auth.tasks import lifespan_tasks
 from config import settings
+from database import read_your_writes_middleware
 from exceptions import validation_exception_handler
 from routers import main_router
 
@@ -18,6 +19,7 @@ fastapi_app = FastAPI(
 fastapi_app.include_router(main_router)
 
 fastapi_app.add_exception_handler(RequestValidationError, validation_exception_handler)
+fastapi_app.middleware('http')(read_your_writes_middleware)
 
 if __name__ == '__main__':
     uvicorn.run(
@@ -35,8 +35,7 @@ class MenuOrm(AppBaseClass):
         foreign_keys=[
             created_by_id,
         ],
-        lazy='joined',
-        join_depth=1,
+        lazy='raise',
     )
     # Черная магия, но иначе отношение будет работать в обе стороны
     # Без лямбды UsersOrm не определено к этому моменту
@@ -47,8 +46,7 @@ class MenuOrm(AppBaseClass):
         foreign_keys=[
             updated_by_id,
         ],
-        lazy='joined',
-        join_depth=1,
+        lazy='raise',
     )
     # remote_side=lambda: [UsersOrm.id])
 
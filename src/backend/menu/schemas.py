@@ -40,3 +40,25 @@ class MenuUploadSchema(BaseModel):
     """Схема загрузки справочника из файла."""
 
     created_by_id: int
+
+
+class MenuItemShortSchema(BaseModel):
+    """Схема элемента справочника для снимка меню бота."""
+
+    id: int
+    button_text: str
+    answer: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuVersionSchema(BaseModel):
+    """Схема версии справочника."""
+
+    version: str
+
+
+class MenuSnapshotSchema(MenuVersionSchema):
+    """Схема полного снимка справочника."""
+
+    items: list[MenuItemShortSchema]
@@ -2,8 +2,9 @@ from fastapi import HTTPException, status
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import apaginate
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from base_service import BaseService
 from menu.constants import (
@@ -14,14 +15,19 @@ from menu.constants import (
 from menu.models import MenuOrm
 from menu.schemas import (
     MenuItemCreateSchema,
+    MenuItemShortSchema,
     MenuItemUpdateSchema,
+    MenuSnapshotSchema,
 )
 from users.models import UsersOrm
-from users.service import user_service
+from users.service import USER_ROLE_OPTIONS, user_service
 
 
 class MenuService(BaseService):
     """Класс сервисных методов модели."""
+    # Связи для схемы MenuItemReadSchema
+    loader_options = (joinedload(MenuOrm.created_by), joinedload(MenuOrm.updated_by))
+
     def __init__(self) -> None:
         super().__init__(MenuOrm)
 
@@ -46,7 +52,7 @@ class MenuService(BaseService):
     ) -> MenuOrm:
         """Создаем новый элемент справочника."""
         author: UsersOrm | None = await user_service.get(
-            session, data_input.created_by_id
+            session, data_input.created_by_id, options=USER_ROLE_OPTIONS
         )
 
         # Если указанный автор не существует или не имеет полномочий:
@@ -75,10 +81,10 @@ class MenuService(BaseService):
         self, session: AsyncSession, menu_item_id: int, data_input: MenuItemUpdateSchema
     ) -> MenuOrm:
         """Изменяем существующий элемент справочника."""
-        menu_item: MenuOrm = await self.get(session, menu_item_id)
+        menu_item: MenuOrm = await self.get(session, menu_item_id, options=())
 
         editor: UsersOrm | None = await user_service.get(
-            session, data_input.updated_by_id
+            session, data_input.updated_by_id, options=USER_ROLE_OPTIONS
         )
 
         # Если указанный автор не существует или не имеет полномочий:
@@ -105,7 +111,7 @@ class MenuService(BaseService):
         page_params: Params = None,
     ) -> Page:
         """Получаем страницу с элементами справочника."""
-        query = select(self.model).order_by(*self.model.__order_by__)
+        query = select(self.model).options(*self.loader_options).order_by(*self.model.__order_by__)
         result: Page = await apaginate(session, query, page_params)
         logger.log(
             'DB_ACCESS',
@@ -113,6 +119,58 @@ class MenuService(BaseService):
         )
         return result
 
+    async def get_menu_short_page(
+        self,
+        session: AsyncSession,
+        page_params: Params,
+    ) -> Page:
+        """Получаем страницу справочника только с полями, нужными боту."""
+        query = select(MenuOrm.id, MenuOrm.button_text, MenuOrm.answer).order_by(
+            *self.model.__order_by__
+        )
+        result: Page = await apaginate(
+            session,
+            query,
+            page_params,
+            transformer=lambda items: [MenuItemShortSchema.model_validate(el) for el in items],
+        )
+        logger.log(
+            'DB_ACCESS',
+            f'Data retrieve: model={self.model.__name__}, {len(result.items)} entries retrieved',
+        )
+        return result
+
+    async def get_menu_version(
+        self,
+        session: AsyncSession,
+    ) -> str:
+        """Получаем версию справочника одним агрегирующим запросом."""
+        # id не переиспользуются, поэтому тройка (число записей, max id, max updated_at)
+        # меняется при любом создании, изменении, удалении или перезагрузке справочника
+        query = select(
+            func.count(MenuOrm.id), func.max(MenuOrm.id), func.max(MenuOrm.updated_at)
+        )
+        result = await session.execute(query)
+        count, max_id, last_update = result.one()
+        last_update = last_update.timestamp() if last_update else 0
+        return f'{count}-{max_id or 0}-{last_update}'
+
+    async def get_menu_snapshot(
+        self,
+        session: AsyncSession,
+    ) -> MenuSnapshotSchema:
+        """Получаем полный снимок справочника вместе с его версией."""
+        version = await self.get_menu_version(session)
+
+        query = select(MenuOrm.id, MenuOrm.button_text, MenuOrm.answer).order_by(MenuOrm.id)
+        result = await session.execute(query)
+        items = [MenuItemShortSchema.model_validate(el) for el in result.all()]
+        logger.log(
+            'DB_ACCESS',
+            f'Data retrieve: model={self.model.__name__}, snapshot of {len(items)} entries retrieved',
+        )
+        return MenuSnapshotSchema(version=version, items=items)
+
     async def _is_button_text_available(
         self,
         session: AsyncSession,
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page, Params
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from base_schemas import UploadReportSchema
 from config import settings as s
-from database import get_async_session
+from database import get_async_read_session, get_async_session
 from menu.schemas import (
     MenuItemCreateSchema,
     MenuItemReadSchema,
     MenuItemUpdateSchema,
+    MenuSnapshotSchema,
     MenuUploadSchema,
+    MenuVersionSchema,
 )
 from menu.service import menu_service
+from snapshots.schemas import SnapshotReadSchema
+from utils import csv_streaming_response, upload_report_response
 
 menu_router = APIRouter()
 
@@ -19,19 +25,51 @@ menu_router = APIRouter()
     '/', response_model=Page[MenuItemReadSchema], summary='Получить записи справочника'
 )
 async def get_menu_page(
-    page_params: Params = Depends(), session: AsyncSession = Depends(get_async_session)
+    page_params: Params = Depends(), session: AsyncSession = Depends(get_async_read_session)
 ) -> Page[MenuItemReadSchema]:
     """Эндпоинт получения записи справочника."""
     menu_page = await menu_service.get_menu_page(session, page_params)
     return menu_page
 
 
+@menu_router.get(
+    '/version', response_model=MenuVersionSchema, summary='Получить версию справочника'
+)
+async def get_menu_version(
+    session: AsyncSession = Depends(get_async_read_session),
+) -> MenuVersionSchema:
+    """Эндпоинт получения версии справочника."""
+    version = await menu_service.get_menu_version(session)
+    return MenuVersionSchema(version=version)
+
+
+@menu_router.get(
+    '/snapshot', response_model=MenuSnapshotSchema, summary='Получить справочник целиком'
+)
+async def get_menu_snapshot(
+    session: AsyncSession = Depends(get_async_read_session),
+) -> MenuSnapshotSchema:
+    """Эндпоинт получения полного снимка справочника для бота."""
+    snapshot = await menu_service.get_menu_snapshot(session)
+    return snapshot
+
+
+@menu_router.get(
+    '/export',
+    response_class=StreamingResponse,
+    summary='Выгрузить справочник в CSV',
+)
+async def export_menu() -> StreamingResponse:
+    """Эндпоинт потоковой выгрузки справочника в CSV."""
+    return csv_streaming_response(menu_service.stream_csv(), 'menu.csv')
+
+
 @menu_router.get(
     '/{menu_item_id}', response_model=MenuItemReadSchema, summary='Получить запись справочника'
 )
 async def get_menu_item(
     menu_item_id: int,
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ) -> MenuItemReadSchema:
     """Эндпоинт получения записи справочника."""
     menu_item = await menu_service.get_menu_item(session, menu_item_id)
@@ -84,13 +122,30 @@ async def download_menu(
 
 
 @menu_router.post(
-    '/upload', response_model=None, summary='Загрузить справочник из файла'
+    '/upload',
+    response_model=UploadReportSchema,
+    responses={status.HTTP_422_UNPROCESSABLE_ENTITY: {'description': 'Файл содержит ошибки, данные не изменены'}},
+    summary='Загрузить справочник из файла',
 )
 async def upload_menu(
     data_input: MenuUploadSchema,
     session: AsyncSession = Depends(get_async_session),
-) -> None:
+) -> UploadReportSchema:
     """Эндпоинт загрузки справочника из файла."""
-    await menu_service.upload_data(
+    report: UploadReportSchema = await menu_service.upload_data(
         session, s.FIXTURES_MENU_PATH, MenuItemCreateSchema, data_input.created_by_id
     )
+    return upload_report_response(report)
+
+
+@menu_router.post(
+    '/restore',
+    response_model=SnapshotReadSchema,
+    summary='Восстановить справочник из последней копии',
+)
+async def restore_menu(
+    session: AsyncSession = Depends(get_async_session),
+) -> SnapshotReadSchema:
+    """Эндпоинт восстановления справочника из копии, снятой перед последней загрузкой."""
+    snapshot: SnapshotReadSchema = await menu_service.restore_data(session)
+    return snapshot
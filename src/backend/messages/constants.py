@@ -7,5 +7,39 @@ ERROR_MESSAGE_NO_PERMISSION = (
 )
 ERROR_MESSAGE_EMPLOYEE_EXISTS = 'Сотрудник уже существует'
 ERROR_MESSAGE_EMPLOYEE_NOT_EXIST = 'Запись не существует'
+ERROR_MESSAGE_CURSOR_CONFLICT = 'Укажите только один из параметров before или after'
 
 MESSAGE_FROM_MANAGER_PREFIX = 'Поступил ответ менеджера: '
+
+# Курсорная пагинация чата
+CHAT_CURSOR_DEFAULT_SIZE = 50
+CHAT_CURSOR_MAX_SIZE = 200
+
+# Доставка ответов менеджеров через Telegram Bot API
+DELIVERY_GLOBAL_RATE_PER_SECOND = 30
+DELIVERY_CHAT_RATE_PER_SECOND = 1
+DELIVERY_WORKERS = 4
+DELIVERY_QUEUE_MAX_SIZE = 10000
+# Пауза после ответа 429, если Telegram не указал retry_after
+DELIVERY_RETRY_DELAY_IN_SECONDS = 1
+DELIVERY_HTTP_TIMEOUT_IN_SECONDS = 10
+DELIVERY_HTTP_MAX_CONNECTIONS = 20
+DELIVERY_SHUTDOWN_TIMEOUT_IN_SECONDS = 10
+DELIVERY_LATENCY_WINDOW = 1000
+
+# Статусы доставки ответов менеджеров
+DELIVERY_STATUS_PENDING = 'pending'
+DELIVERY_STATUS_DELIVERED = 'delivered'
+DELIVERY_STATUS_FAILED = 'failed'
+DELIVERY_STATUS_MAX_LENGTH = 16
+DELIVERY_ERROR_MAX_LENGTH = 255
+DELIVERY_ERROR_TEXT = 'Сообщение не доставлено в Telegram'
+
+# Обработка очереди исходящих сообщений (outbox)
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_POLL_INTERVAL_IN_SECONDS = 1
+OUTBOX_LEASE_IN_SECONDS = 120
+OUTBOX_LEASE_RENEW_INTERVAL_IN_SECONDS = 30
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY_IN_SECONDS = 30
+OUTBOX_SHUTDOWN_TIMEOUT_IN_SECONDS = 15
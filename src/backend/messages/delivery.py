@@ -0,0 +1,232 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from fastapi import status
+from httpx import AsyncClient, HTTPError, Limits, Timeout
+from loguru import logger
+
+from config import settings
+from messages.constants import (
+    DELIVERY_CHAT_RATE_PER_SECOND,
+    DELIVERY_GLOBAL_RATE_PER_SECOND,
+    DELIVERY_HTTP_MAX_CONNECTIONS,
+    DELIVERY_HTTP_TIMEOUT_IN_SECONDS,
+    DELIVERY_LATENCY_WINDOW,
+    DELIVERY_QUEUE_MAX_SIZE,
+    DELIVERY_RETRY_DELAY_IN_SECONDS,
+    DELIVERY_SHUTDOWN_TIMEOUT_IN_SECONDS,
+    DELIVERY_WORKERS,
+)
+from messages.schemas import DeliveryStatsSchema
+from messages.utils import send_telegram_message
+
+
+class TokenBucket:
+    """Ограничитель частоты отправки по алгоритму token bucket."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def is_idle(self) -> bool:
+        """Корзина полна - ее можно удалить без потери ограничения."""
+        self._refill()
+        return self.tokens >= self.capacity
+
+    async def acquire(self) -> None:
+        """Ждем, пока в корзине появится токен, и забираем его."""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class DeliveryResult:
+    """Результат одной попытки доставки; повторы выполняет outbox."""
+
+    delivered: bool
+    # Ошибка временная (сеть, 5xx, 429, переполнение очереди) - попытку стоит повторить
+    retryable: bool = False
+    # Через сколько секунд Telegram разрешил повторить отправку (ответ 429)
+    retry_after: float = 0
+
+
+@dataclass
+class DeliveryJob:
+    """Задание на доставку одного сообщения."""
+
+    chat_id: int
+    text: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class TelegramDeliveryService:
+    """Очередь доставки ответов менеджеров с учетом лимитов Telegram.
+
+    Лимиты Telegram общие для бота, поэтому делятся поровну между процессами бэкенда.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[DeliveryJob] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._client: AsyncClient | None = None
+        self._global_rate = DELIVERY_GLOBAL_RATE_PER_SECOND / settings.BACKEND_PROCESSES
+        self._chat_rate = DELIVERY_CHAT_RATE_PER_SECOND / settings.BACKEND_PROCESSES
+        self._global_bucket = TokenBucket(self._global_rate, max(1.0, self._global_rate))
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        # До этого момента Telegram просил не отправлять сообщения (ответ 429)
+        self._paused_until = 0.0
+        self._latencies: deque[float] = deque(maxlen=DELIVERY_LATENCY_WINDOW)
+        self._counters = {'sent': 0, 'failed': 0, 'retried': 0, 'throttled': 0, 'rejected': 0}
+
+    async def start(self) -> None:
+        """Создаем пул соединений и запускаем обработчики очереди."""
+        self._client = AsyncClient(
+            base_url=f'{settings.TELEGRAM_API_URL}{settings.TELEGRAM_BOT_TOKEN}',
+            limits=Limits(
+                max_connections=DELIVERY_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=DELIVERY_HTTP_MAX_CONNECTIONS,
+            ),
+            timeout=Timeout(DELIVERY_HTTP_TIMEOUT_IN_SECONDS),
+        )
+        self._queue = asyncio.Queue(maxsize=DELIVERY_QUEUE_MAX_SIZE)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(DELIVERY_WORKERS)]
+        logger.info(f'✅ Telegram delivery started with {DELIVERY_WORKERS} workers')
+
+    async def stop(self) -> None:
+        """Дожидаемся отправки очереди и освобождаем ресурсы."""
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=DELIVERY_SHUTDOWN_TIMEOUT_IN_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f'⚠️  Telegram delivery stopped with {self._queue.qsize()} undelivered messages')
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # Неотправленные сообщения outbox повторит позже
+        while self._queue is not None and not self._queue.empty():
+            self._complete(self._queue.get_nowait(), DeliveryResult(delivered=False, retryable=True))
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def enqueue(self, chat_id: int, text: str) -> asyncio.Future:
+        """Ставим сообщение в очередь, результат доставки придет в future."""
+        future = asyncio.get_running_loop().create_future()
+        job = DeliveryJob(chat_id=chat_id, text=text, future=future)
+
+        try:
+            self._queue.put_nowait(job)
+        except (asyncio.QueueFull, AttributeError):
+            self._counters['rejected'] += 1
+            logger.error(f'❌ Telegram delivery queue is unavailable or full, message to {chat_id} rejected')
+            future.set_result(DeliveryResult(delivered=False, retryable=True))
+
+        return future
+
+    async def deliver(self, chat_id: int, text: str) -> DeliveryResult:
+        """Ставим сообщение в очередь и дожидаемся результата попытки доставки."""
+        return await self.enqueue(chat_id, text)
+
+    def get_stats(self) -> DeliveryStatsSchema:
+        """Метрики очереди доставки."""
+        latencies = sorted(self._latencies)
+        return DeliveryStatsSchema(
+            queue_depth=self._queue.qsize() if self._queue is not None else 0,
+            paused_for=max(0.0, round(self._paused_until - time.monotonic(), 1)),
+            latency_avg_ms=round(sum(latencies) / len(latencies), 1) if latencies else None,
+            latency_p95_ms=latencies[int(len(latencies) * 0.95) - 1] if latencies else None,
+            **self._counters,
+        )
+
+    async def _worker(self) -> None:
+        """Обработчик очереди доставки."""
+        while True:
+            job = await self._queue.get()
+            # Ожидание отменено (outbox остановлен) - не отправляем, задание вернется после аренды
+            if job.future.done():
+                self._queue.task_done()
+                continue
+            try:
+                await self._send(job)
+            except Exception as e:
+                logger.error(f'❌ Unexpected error while delivering message to {job.chat_id}: {e!r}')
+                self._complete(job, DeliveryResult(delivered=False, retryable=True))
+            finally:
+                self._queue.task_done()
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        """Корзина лимита конкретного чата, простаивающие корзины удаляем."""
+        if chat_id not in self._chat_buckets:
+            if len(self._chat_buckets) > DELIVERY_QUEUE_MAX_SIZE:
+                self._chat_buckets = {k: v for k, v in self._chat_buckets.items() if not v.is_idle()}
+            self._chat_buckets[chat_id] = TokenBucket(self._chat_rate, 1)
+        return self._chat_buckets[chat_id]
+
+    async def _send(self, job: DeliveryJob) -> None:
+        """Одна попытка отправки сообщения с соблюдением лимитов."""
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+        await self._global_bucket.acquire()
+        await self._chat_bucket(job.chat_id).acquire()
+
+        started_at = time.monotonic()
+        try:
+            response = await send_telegram_message(self._client, job.chat_id, job.text)
+        except HTTPError as e:
+            logger.warning(f'Telegram delivery to {job.chat_id} failed: {e!r}')
+            self._counters['retried'] += 1
+            self._complete(job, DeliveryResult(delivered=False, retryable=True))
+            return
+        self._latencies.append((time.monotonic() - started_at) * 1000)
+
+        if response.status_code == status.HTTP_200_OK:
+            self._counters['sent'] += 1
+            self._complete(job, DeliveryResult(delivered=True))
+            return
+
+        if response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+            # Telegram сообщает, сколько секунд нужно подождать
+            retry_after = response.json().get('parameters', {}).get('retry_after', DELIVERY_RETRY_DELAY_IN_SECONDS)
+            self._counters['throttled'] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            logger.warning(f'Telegram flood limit hit, delivery paused for {retry_after}s')
+            self._complete(job, DeliveryResult(delivered=False, retryable=True, retry_after=retry_after))
+            return
+
+        if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            self._counters['retried'] += 1
+            self._complete(job, DeliveryResult(delivered=False, retryable=True))
+            return
+
+        # Ошибки 4xx (чат не найден, бот заблокирован и т.п.) повторять бессмысленно
+        logger.error(f'❌ Telegram rejected message to {job.chat_id}: {response.status_code} {response.text}')
+        self._counters['failed'] += 1
+        self._complete(job, DeliveryResult(delivered=False))
+
+    @staticmethod
+    def _complete(job: DeliveryJob, result: DeliveryResult) -> None:
+        if not job.future.done():
+            job.future.set_result(result)
+
+
+delivery_service = TelegramDeliveryService()
@@ -5,6 +5,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
@@ -16,6 +17,8 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import AppBaseClass
 from messages.constants import (
+    DELIVERY_ERROR_MAX_LENGTH,
+    DELIVERY_STATUS_MAX_LENGTH,
     EMPLOYEE_NAME_MAX_LENGTH,
     MESSAGE_TEXT_MAX_LENGTH,
 )
@@ -37,20 +40,84 @@ class MessagesOrm(AppBaseClass):
         DateTime, server_default=func.now(), nullable=False)
     is_read: Mapped[bool] = mapped_column(
         Boolean, server_default=t('false'), default=False)
+    # Статус доставки заполняется только для ответов менеджеров
+    delivery_status: Mapped[str] = mapped_column(
+        String(DELIVERY_STATUS_MAX_LENGTH), nullable=True)
+    delivered_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True)
+    delivery_error: Mapped[str] = mapped_column(
+        String(DELIVERY_ERROR_MAX_LENGTH), nullable=True)
 
     manager: Mapped['UsersOrm'] = relationship(  # pyright: ignore[reportUndefinedVariable]  # noqa: F821
         'UsersOrm',
-        lazy='joined',
+        lazy='raise',
     )
 
     employee: Mapped['EmployeesOrm'] = relationship(
         'EmployeesOrm',
-        lazy='joined',
+        lazy='raise',
         # back_populates='messages'
     )
 
     __order_by__ = (func.lower(created_at).asc(),)
 
+    def to_dict(self) -> dict:
+        """Используется для выгрузки в csv."""
+        return {
+            'id': self.id,
+            'employee_id': self.employee_id,
+            'employee_name': self.employee.name if self.employee else None,
+            'manager': self.manager.username if self.manager else None,
+            'text': self.text,
+            'created_at': self.created_at.isoformat(),
+            'is_read': self.is_read,
+            'delivery_status': self.delivery_status,
+        }
+
+    __table_args__ = (
+        # Чат сотрудника: фильтр по сотруднику и курсорная сортировка по (created_at, id)
+        Index('ix_messages_employee_id_created_at_id', 'employee_id', 'created_at', 'id'),
+        # Непрочитанные сообщения: счетчики списка чатов и отметка о прочтении
+        Index(
+            'ix_messages_employee_id_unread',
+            'employee_id',
+            postgresql_where=t('is_read = false'),
+        ),
+    )
+
+
+class MessageOutboxOrm(AppBaseClass):
+    """Модель очереди доставки ответов менеджеров в Telegram."""
+
+    __tablename__ = 'message_outbox'
+
+    message_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('messages.id', ondelete='CASCADE'), nullable=False, unique=True
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, server_default=t('0'), default=0, nullable=False)
+    # Раньше этого момента задание не берется в работу (повтор или обработка другим воркером)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False)
+
+
+class ChatSummaryOrm(AppBaseClass):
+    """Модель сводки по чату с сотрудником для списка чатов."""
+
+    __tablename__ = 'chat_summary'
+
+    employee_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey('employees.id', ondelete='CASCADE'), nullable=False, unique=True
+    )
+    unread_count: Mapped[int] = mapped_column(
+        Integer, server_default=t('0'), default=0, nullable=False)
+    last_message_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True, index=True)
+    last_message_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('messages.id', ondelete='SET NULL'), nullable=True)
+
 
 class EmployeesOrm(AppBaseClass):
     """Модель таблицы сотрудников."""
@@ -0,0 +1,202 @@
+import asyncio
+from datetime import timedelta
+
+from loguru import logger
+from sqlalchemy import delete, func, select, update
+
+from database import AsyncSessionLocal
+from messages.constants import (
+    DELIVERY_ERROR_TEXT,
+    DELIVERY_STATUS_DELIVERED,
+    DELIVERY_STATUS_FAILED,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_IN_SECONDS,
+    OUTBOX_LEASE_RENEW_INTERVAL_IN_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_INTERVAL_IN_SECONDS,
+    OUTBOX_RETRY_DELAY_IN_SECONDS,
+    OUTBOX_SHUTDOWN_TIMEOUT_IN_SECONDS,
+)
+from messages.delivery import DeliveryResult, delivery_service
+from messages.models import MessageOutboxOrm, MessagesOrm
+
+
+class OutboxDispatcher:
+    """Доставка ответов менеджеров из таблицы-очереди outbox.
+
+    Задания забираются пачками через FOR UPDATE SKIP LOCKED и арендуются на время
+    отправки, поэтому несколько воркеров бэкенда не отправят одно сообщение дважды.
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        """Запускаем фоновую обработку очереди."""
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Дожидаемся обработки текущей пачки и останавливаемся."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=OUTBOX_SHUTDOWN_TIMEOUT_IN_SECONDS)
+        except asyncio.TimeoutError:
+            # Незавершенные задания вернутся в работу после окончания аренды
+            logger.warning('⚠️  Outbox dispatcher was cancelled on shutdown')
+        self._task = None
+
+    async def _run(self) -> None:
+        """Основной цикл: берем пачку заданий, отправляем, записываем результат."""
+        while not self._stopping.is_set():
+            try:
+                processed = await self._process_batch()
+            except Exception as e:
+                logger.log('DB_ACCESS', f'Outbox processing error: {e!r}')
+                processed = 0
+
+            # Пока очередь не пуста, сразу берем следующую пачку
+            if processed < OUTBOX_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=OUTBOX_POLL_INTERVAL_IN_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _process_batch(self) -> int:
+        """Обрабатываем одну пачку заданий, возвращаем их количество."""
+        jobs = await self._claim_jobs()
+        if not jobs:
+            return 0
+
+        async with AsyncSessionLocal() as session:
+            query = select(MessagesOrm.id, MessagesOrm.employee_id, MessagesOrm.text).where(
+                MessagesOrm.id.in_([job.message_id for job in jobs])
+            )
+            messages = {row.id: row for row in (await session.execute(query)).all()}
+        # Удаленные за это время сообщения удаляют и свои задания каскадно
+        jobs = [job for job in jobs if job.message_id in messages]
+
+        deliveries = [
+            asyncio.create_task(
+                delivery_service.deliver(messages[job.message_id].employee_id, messages[job.message_id].text)
+            )
+            for job in jobs
+        ]
+        # Пока идет доставка (в том числе пауза по retry_after), аренда не должна истечь
+        lease = asyncio.create_task(self._renew_lease([job.id for job in jobs]))
+        try:
+            await asyncio.gather(*deliveries)
+        finally:
+            lease.cancel()
+            # При отмене на остановке сохраняем результаты уже завершенных доставок,
+            # иначе они будут отправлены повторно после окончания аренды
+            finished = [
+                (job, delivery.result()) for job, delivery in zip(jobs, deliveries)
+                if delivery.done() and not delivery.cancelled() and delivery.exception() is None
+            ]
+            for delivery in deliveries:
+                delivery.cancel()
+            if finished:
+                finished_jobs, results = zip(*finished)
+                await self._save_results(list(finished_jobs), list(results))
+
+        return len(jobs)
+
+    async def _renew_lease(self, job_ids: list[int]) -> None:
+        """Продлеваем аренду заданий, пока они доставляются."""
+        while True:
+            await asyncio.sleep(OUTBOX_LEASE_RENEW_INTERVAL_IN_SECONDS)
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(
+                        update(MessageOutboxOrm)
+                        .where(MessageOutboxOrm.id.in_(job_ids))
+                        .values(available_at=func.now() + timedelta(seconds=OUTBOX_LEASE_IN_SECONDS))
+                    )
+                    await session.commit()
+            except Exception as e:
+                logger.log('DB_ACCESS', f'Outbox lease renewal error: {e!r}')
+
+    async def _claim_jobs(self) -> list:
+        """Забираем доступные задания и арендуем их, сдвигая available_at."""
+        available = (
+            select(MessageOutboxOrm.id)
+            .where(MessageOutboxOrm.available_at <= func.now())
+            .order_by(MessageOutboxOrm.id)
+            .limit(OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(MessageOutboxOrm)
+            .where(MessageOutboxOrm.id.in_(available.scalar_subquery()))
+            .values(
+                attempts=MessageOutboxOrm.attempts + 1,
+                available_at=func.now() + timedelta(seconds=OUTBOX_LEASE_IN_SECONDS),
+            )
+            .returning(MessageOutboxOrm.id, MessageOutboxOrm.message_id, MessageOutboxOrm.attempts)
+        )
+
+        async with AsyncSessionLocal() as session:
+            jobs = (await session.execute(stmt)).all()
+            # Пустая выборка ничего не изменила: транзакцию не коммитим, она откатится
+            if not jobs:
+                return jobs
+            await session.commit()
+
+        logger.log('DB_ACCESS', f'Entry change: model={MessageOutboxOrm.__name__}, {len(jobs)} jobs claimed')
+        return jobs
+
+    async def _save_results(self, jobs: list, results: list[DeliveryResult]) -> None:
+        """Фиксируем статусы доставки и убираем завершенные задания.
+
+        Повторы выполняются только здесь: служба доставки делает одну попытку на задание.
+        """
+        delivered = [job for job, result in zip(jobs, results) if result.delivered]
+        failed = [
+            job for job, result in zip(jobs, results)
+            if not result.delivered and (not result.retryable or job.attempts >= OUTBOX_MAX_ATTEMPTS)
+        ]
+        # Задержку повтора увеличиваем до retry_after, если Telegram попросил подождать дольше
+        retried: dict[float, list] = {}
+        for job, result in zip(jobs, results):
+            if not result.delivered and result.retryable and job.attempts < OUTBOX_MAX_ATTEMPTS:
+                delay = max(OUTBOX_RETRY_DELAY_IN_SECONDS, result.retry_after)
+                retried.setdefault(delay, []).append(job)
+
+        async with AsyncSessionLocal() as session:
+            if delivered:
+                await session.execute(
+                    update(MessagesOrm)
+                    .where(MessagesOrm.id.in_([job.message_id for job in delivered]))
+                    .values(delivery_status=DELIVERY_STATUS_DELIVERED, delivered_at=func.now(), delivery_error=None)
+                )
+            if failed:
+                await session.execute(
+                    update(MessagesOrm)
+                    .where(MessagesOrm.id.in_([job.message_id for job in failed]))
+                    .values(delivery_status=DELIVERY_STATUS_FAILED, delivery_error=DELIVERY_ERROR_TEXT)
+                )
+            if delivered or failed:
+                await session.execute(
+                    delete(MessageOutboxOrm).where(MessageOutboxOrm.id.in_([job.id for job in delivered + failed]))
+                )
+            for delay, delayed_jobs in retried.items():
+                await session.execute(
+                    update(MessageOutboxOrm)
+                    .where(MessageOutboxOrm.id.in_([job.id for job in delayed_jobs]))
+                    .values(available_at=func.now() + timedelta(seconds=delay))
+                )
+            await session.commit()
+
+        logger.log(
+            'DB_ACCESS',
+            f'Entry change: model={MessageOutboxOrm.__name__}, delivered={len(delivered)}, '
+            f'failed={len(failed)}, retried={sum(len(j) for j in retried.values())}',
+        )
+
+
+outbox_dispatcher = OutboxDispatcher()
@@ -3,7 +3,11 @@ from datetime import datetime
 from fastapi_pagination import Page
 from pydantic import BaseModel, ConfigDict, Field
 
-from messages.constants import MESSAGE_TEXT_MAX_LENGTH
+from messages.constants import (
+    CHAT_CURSOR_DEFAULT_SIZE,
+    CHAT_CURSOR_MAX_SIZE,
+    MESSAGE_TEXT_MAX_LENGTH,
+)
 from users.schemas import UserRelationshipSchema
 
 
@@ -25,6 +29,11 @@ class EmployeeReadSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EmployeeBansVersionSchema(BaseModel):
+    """Класс версии списка заблокированных сотрудников."""
+    version: str
+
+
 class EmployeeChangeSchema(BaseModel):
     """Класс изменения данных сотрудника."""
     is_banned: bool
@@ -47,6 +56,8 @@ class MessageReadSchema(BaseModel):
     manager: UserRelationshipSchema | None
     created_at: datetime
     is_read: bool
+    delivery_status: str | None = None
+    delivered_at: datetime | None = None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -60,6 +71,28 @@ class EmployeeChatSchema(EmployeeReadSchema):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ChatCursorParams(BaseModel):
+    """Класс параметров курсорной пагинации чата."""
+    before: int | None = Field(None, description='Сообщения старше сообщения с этим id')
+    after: int | None = Field(None, description='Сообщения новее сообщения с этим id')
+    size: int = Field(CHAT_CURSOR_DEFAULT_SIZE, ge=1, le=CHAT_CURSOR_MAX_SIZE)
+
+
+class MessagesCursorPageSchema(BaseModel):
+    """Класс страницы сообщений с курсорами, без общего количества."""
+    items: list[MessageReadSchema]
+    size: int
+    prev_cursor: int | None
+    next_cursor: int | None
+
+
+class EmployeeChatCursorSchema(EmployeeReadSchema):
+    """Класс чата с сотрудником с курсорной пагинацией."""
+    messages: MessagesCursorPageSchema
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class EmployeeChatListSchema(BaseModel):
     """Класс списка чатов с сотрудниками."""
     id: int
@@ -69,3 +102,16 @@ class EmployeeChatListSchema(BaseModel):
     last_message_at: datetime | None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DeliveryStatsSchema(BaseModel):
+    """Класс метрик очереди доставки сообщений в Telegram."""
+    queue_depth: int
+    paused_for: float
+    sent: int
+    failed: int
+    retried: int
+    throttled: int
+    rejected: int
+    latency_avg_ms: float | None
+    latency_p95_ms: float | None
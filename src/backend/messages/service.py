@@ -1,26 +1,135 @@
+from typing import AsyncIterator
+
 from fastapi import HTTPException, status
 from fastapi_pagination import Page, Params
-from fastapi_pagination.ext.sqlalchemy import paginate
+from fastapi_pagination.ext.sqlalchemy import apaginate, paginate
 from loguru import logger
-from sqlalchemy import func, select, update
+from sqlalchemy import delete, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from base_service import BaseService
 from messages.constants import (
+    DELIVERY_STATUS_PENDING,
+    ERROR_MESSAGE_CURSOR_CONFLICT,
     ERROR_MESSAGE_EMPLOYEE_NOT_EXIST,
     ERROR_MESSAGE_NO_PERMISSION,
     ERROR_MESSAGE_USER_IS_BANNED,
 )
-from messages.models import EmployeesOrm, MessagesOrm
+from messages.models import ChatSummaryOrm, EmployeesOrm, MessageOutboxOrm, MessagesOrm
 from messages.schemas import (
+    ChatCursorParams,
     EmployeeChangeSchema,
+    EmployeeChatCursorSchema,
     EmployeeChatListSchema,
     EmployeeChatSchema,
     EmployeeCreareSchema,
+    EmployeeReadSchema,
     MessageCreateSchema,
 )
 from users.models import UsersOrm
-from users.service import user_service
+from users.service import USER_ROLE_OPTIONS, user_service
+
+
+class ChatSummaryService(BaseService):
+    """Класс сервисных функций сводки по чатам."""
+
+    def __init__(self) -> None:
+        super().__init__(ChatSummaryOrm)
+
+    async def register_message(
+        self, session: AsyncSession, message: MessagesOrm
+    ) -> None:
+        """Учитываем новое сообщение в сводке, вызывается в транзакции создания сообщения."""
+        # now() возвращает время начала транзакции - то же, что записано в created_at сообщения
+        stmt = pg_insert(ChatSummaryOrm).values(
+            employee_id=message.employee_id,
+            unread_count=0 if message.is_read else 1,
+            last_message_at=func.now(),
+            last_message_id=message.id,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChatSummaryOrm.employee_id],
+            set_={
+                'unread_count': ChatSummaryOrm.unread_count + stmt.excluded.unread_count,
+                'last_message_at': func.greatest(
+                    ChatSummaryOrm.last_message_at, stmt.excluded.last_message_at
+                ),
+                'last_message_id': func.greatest(
+                    ChatSummaryOrm.last_message_id, stmt.excluded.last_message_id
+                ),
+            },
+        )
+        await session.execute(stmt)
+
+    async def reset_unread(
+        self, session: AsyncSession, employee_id: int
+    ) -> None:
+        """Пересчитываем непрочитанные по частичному индексу, вызывается в транзакции отметки о прочтении."""
+        # Сначала блокируем строку сводки: register_message держит ту же блокировку до коммита
+        # нового сообщения, поэтому подсчет ниже (отдельный запрос - свежий снимок) его уже учтет
+        await session.execute(
+            select(ChatSummaryOrm.employee_id)
+            .where(ChatSummaryOrm.employee_id == employee_id)
+            .with_for_update()
+        )
+        unread_count: int = await session.scalar(
+            select(func.count()).where(
+                MessagesOrm.employee_id == employee_id,
+                MessagesOrm.is_read == False,  # noqa: E712
+            )
+        )
+        stmt = (
+            update(ChatSummaryOrm)
+            .where(ChatSummaryOrm.employee_id == employee_id)
+            .values(unread_count=unread_count)
+        )
+        await session.execute(stmt)
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """Полностью пересобираем сводку по таблице сообщений, возвращаем число чатов."""
+        last_message = (
+            select(
+                MessagesOrm.employee_id,
+                MessagesOrm.id,
+                MessagesOrm.created_at,
+            )
+            .distinct(MessagesOrm.employee_id)
+            .order_by(MessagesOrm.employee_id, MessagesOrm.created_at.desc(), MessagesOrm.id.desc())
+            .subquery()
+        )
+        unread = (
+            select(MessagesOrm.employee_id, func.count().label('unread_count'))
+            .where(MessagesOrm.is_read == False)  # noqa: E712
+            .group_by(MessagesOrm.employee_id)
+            .subquery()
+        )
+        source = select(
+            last_message.c.employee_id,
+            func.coalesce(unread.c.unread_count, 0),
+            last_message.c.created_at,
+            last_message.c.id,
+        ).outerjoin(unread, unread.c.employee_id == last_message.c.employee_id)
+
+        # Пересборка читает всю таблицу сообщений и дольше общего statement_timeout,
+        # снимаем ограничение только для этой транзакции
+        await session.execute(text('SET LOCAL statement_timeout = 0'))
+        await session.execute(delete(ChatSummaryOrm))
+        result = await session.execute(
+            pg_insert(ChatSummaryOrm).from_select(
+                ['employee_id', 'unread_count', 'last_message_at', 'last_message_id'], source
+            )
+        )
+        await session.commit()
+        logger.log(
+            'DB_ACCESS',
+            f'Data rebuild: model={self.model.__name__}, {result.rowcount} entries created',
+        )
+        return result.rowcount
+
+
+chat_summary_service = ChatSummaryService()
 
 
 class EmployeeService(BaseService):
@@ -30,12 +139,9 @@ class EmployeeService(BaseService):
 
     async def get_or_create_employee(
         self, session: AsyncSession, data_input: EmployeeCreareSchema
-    ) -> EmployeesOrm:
+    ) -> EmployeeReadSchema:
         """Получаем пользователя или создаем нового."""
-        try:
-            employee: EmployeesOrm = await self.get_employee(session, data_input.id)
-        except HTTPException:
-            employee: EmployeesOrm = await self.create(session, data_input)
+        employee: EmployeeReadSchema = await self.upsert_employee(session, data_input)
 
         if employee.is_banned:
             raise HTTPException(
@@ -45,6 +151,29 @@ class EmployeeService(BaseService):
 
         return employee
 
+    async def upsert_employee(
+        self, session: AsyncSession, data_input: EmployeeCreareSchema
+    ) -> EmployeeReadSchema:
+        """Получаем пользователя или создаем нового одним запросом INSERT ... ON CONFLICT ... RETURNING."""
+        stmt = pg_insert(EmployeesOrm).values(**data_input.model_dump())
+        # Конфликт разрешаем обновлением имени, иначе RETURNING не вернет существующую запись.
+        # updated_at не трогаем: по нему считается версия списка блокировок
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmployeesOrm.id],
+            set_={'name': func.coalesce(stmt.excluded.name, EmployeesOrm.name)},
+        ).returning(EmployeesOrm)
+
+        result = await session.execute(stmt, execution_options={'populate_existing': True})
+        # Схему собираем до коммита, после него атрибуты объекта ORM устаревают
+        employee = EmployeeReadSchema.model_validate(result.scalar_one())
+        await session.commit()
+        logger.log(
+            'DB_ACCESS',
+            f'Entry upsert: model={self.model.__name__}, id={employee.id}',
+        )
+
+        return employee
+
     async def get_employee(
         self,
         session: AsyncSession,
@@ -61,40 +190,68 @@ class EmployeeService(BaseService):
 
         return employee
 
-    async def get_employees_chat_list(
+    async def get_bans_version(
         self,
         session: AsyncSession,
-    ) -> list[EmployeeChatListSchema]:
-        """Получаем список чатов кастомным запросом."""
-        # Подзапрос с количеством непрочитанных сообщений и датой последнего
-        message_stats = (
-            select(
-                MessagesOrm.employee_id,
-                func.count().filter(MessagesOrm.is_read == False).label('unread_count'),  # noqa: E712
-                func.max(MessagesOrm.created_at).label('last_message_at'),
-            )
-            .group_by(MessagesOrm.employee_id)
-            .subquery()
+    ) -> str:
+        """Получаем версию списка блокировок одним агрегирующим запросом."""
+        # Блокировка/разблокировка меняет updated_at и заполняет updated_by_id сотрудника;
+        # новые сотрудники без блокировок (updated_by_id пуст) версию не меняют
+        query = select(
+            func.count().filter(EmployeesOrm.is_banned == True),  # noqa: E712
+            func.max(EmployeesOrm.updated_at).filter(EmployeesOrm.updated_by_id.is_not(None)),
         )
+        result = await session.execute(query)
+        banned_count, last_update = result.one()
+        last_update = last_update.timestamp() if last_update else 0
+        return f'{banned_count}-{last_update}'
+
+    async def get_employees_chat_list(
+        self,
+        session: AsyncSession,
+        unread: bool | None = None,
+        is_banned: bool | None = None,
+        name: str | None = None,
+        page_params: Params | None = None,
+    ) -> Page:
+        """Получаем страницу списка чатов из сводки, не читая таблицу сообщений."""
+        filters = list()
+
+        if unread is not None:
+            unread_count = func.coalesce(ChatSummaryOrm.unread_count, 0)
+            filters.append(unread_count > 0 if unread else unread_count == 0)
+
+        if is_banned is not None:
+            filters.append(EmployeesOrm.is_banned == is_banned)
+
+        if name is not None:
+            filters.append(EmployeesOrm.name.icontains(name, autoescape=True))
 
-        # Основной запрос с данными сотрудников и данными подзапроса
         stmt = (
             select(
                 EmployeesOrm.id,
                 EmployeesOrm.name,
                 EmployeesOrm.is_banned,
-                func.coalesce(message_stats.c.unread_count, 0).label('unread_count'),
-                message_stats.c.last_message_at,
+                func.coalesce(ChatSummaryOrm.unread_count, 0).label('unread_count'),
+                ChatSummaryOrm.last_message_at,
             )
-            .outerjoin(message_stats, EmployeesOrm.id == message_stats.c.employee_id)
-            .order_by(message_stats.c.last_message_at.desc().nullslast())
+            .outerjoin(ChatSummaryOrm, EmployeesOrm.id == ChatSummaryOrm.employee_id)
+            .filter(*filters)
+            # id в сортировке нужен для стабильных границ страниц
+            .order_by(ChatSummaryOrm.last_message_at.desc().nullslast(), EmployeesOrm.id)
         )
 
-        employees = await session.execute(stmt)
-        employees = employees.all()
-        employees = [EmployeeChatListSchema.model_validate(e) for e in employees]
-
-        return employees
+        result: Page = await apaginate(
+            session,
+            stmt,
+            page_params,
+            transformer=lambda items: [EmployeeChatListSchema.model_validate(e) for e in items],
+        )
+        logger.log(
+            'DB_ACCESS',
+            f'Data retrieve: model={self.model.__name__}, {len(result.items)} entries retrieved',
+        )
+        return result
 
     async def ban_unban_employee(
         self,
@@ -105,7 +262,7 @@ class EmployeeService(BaseService):
         """Блокируем/разблокируем сотрудника."""
         # Проверяем существование и полномочия менеджера
         manager: UsersOrm | None = await user_service.get(
-            session, data_input.updated_by_id
+            session, data_input.updated_by_id, options=USER_ROLE_OPTIONS
         )
         if not manager or not manager.is_active or not manager.role.can_send_messages:
             raise HTTPException(
@@ -125,6 +282,8 @@ employee_service = EmployeeService()
 
 class MessagesService(BaseService):
     """Класс сервисных функций модели."""
+    # Связи для схемы MessageReadSchema: сотрудник в чате известен и так
+    loader_options = (joinedload(MessagesOrm.manager),)
 
     def __init__(self) -> None:
         super().__init__(MessagesOrm)
@@ -144,7 +303,7 @@ class MessagesService(BaseService):
 
         if data_input.manager_id is not None:
             manager: UsersOrm | None = await user_service.get(
-                session, data_input.manager_id
+                session, data_input.manager_id, options=USER_ROLE_OPTIONS
             )
 
             # Если указанный менеджер не существует или не имеет полномочий:
@@ -160,10 +319,34 @@ class MessagesService(BaseService):
 
             data_input.is_read = True
 
-        new_message: MessagesOrm = await self.create(session, data_input)
+        new_message: MessagesOrm = await self.save_message(session, data_input)
 
         return new_message
 
+    async def save_message(
+        self, session: AsyncSession, data_input: MessageCreateSchema
+    ) -> MessagesOrm:
+        """Сохраняем сообщение, сводку по чату и задание на доставку ответа в одной транзакции."""
+        new_message = MessagesOrm(**data_input.model_dump())
+        is_manager_reply = data_input.manager_id is not None
+        if is_manager_reply:
+            new_message.delivery_status = DELIVERY_STATUS_PENDING
+        session.add(new_message)
+        # Получаем id сообщения до коммита, чтобы сослаться на него из сводки и задания
+        await session.flush()
+
+        if is_manager_reply:
+            session.add(MessageOutboxOrm(message_id=new_message.id))
+        await chat_summary_service.register_message(session, new_message)
+
+        await session.commit()
+        new_message = await self._reload(session, new_message)
+        logger.log(
+            'DB_ACCESS',
+            f'Entry creation: model={self.model.__name__}, id={new_message.id}',
+        )
+        return new_message
+
     async def mark_chat_as_read(
         self,
         session: AsyncSession,
@@ -172,10 +355,14 @@ class MessagesService(BaseService):
         """Помечаем сообщения чата прочитанными."""
         stmt = (
             update(MessagesOrm)
-            .where(MessagesOrm.employee_id == employee_id)
+            .where(
+                MessagesOrm.employee_id == employee_id,
+                MessagesOrm.is_read == False,  # noqa: E712
+            )
             .values(is_read=True)
         )
         result = await session.execute(stmt)
+        await chat_summary_service.reset_unread(session, employee_id)
         await session.commit()
         logger.log(
             'DB_ACCESS',
@@ -193,6 +380,7 @@ class MessagesService(BaseService):
 
         query = (
             select(MessagesOrm)
+            .options(*self.loader_options)
             .where(MessagesOrm.employee_id == employee.id)
             .order_by(MessagesOrm.created_at.asc())
         )
@@ -204,5 +392,84 @@ class MessagesService(BaseService):
 
         return chat_schema
 
+    async def get_employee_chat_by_cursor(
+        self,
+        session: AsyncSession,
+        employee_id: int,
+        cursor_params: ChatCursorParams,
+    ) -> EmployeeChatCursorSchema:
+        """Получаем чат с сотрудником с пагинацией по ключу (created_at, id) без подсчета total."""
+        if cursor_params.before is not None and cursor_params.after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=ERROR_MESSAGE_CURSOR_CONFLICT,
+            )
+
+        employee: EmployeesOrm = await employee_service.get_employee(session, employee_id)
+
+        key = tuple_(MessagesOrm.created_at, MessagesOrm.id)
+        query = (
+            select(MessagesOrm)
+            .options(*self.loader_options)
+            .where(MessagesOrm.employee_id == employee.id)
+        )
+
+        # Курсор - id сообщения, позицию в ключе получаем подзапросом
+        cursor_id = cursor_params.after if cursor_params.after is not None else cursor_params.before
+        if cursor_id is not None:
+            cursor_key = tuple_(
+                select(MessagesOrm.created_at).where(MessagesOrm.id == cursor_id).scalar_subquery(),
+                cursor_id,
+            )
+
+        # Берем на одну запись больше, чтобы узнать, есть ли следующая страница
+        if cursor_params.after is not None:
+            query = query.where(key > cursor_key).order_by(
+                MessagesOrm.created_at.asc(), MessagesOrm.id.asc()
+            )
+        else:
+            if cursor_params.before is not None:
+                query = query.where(key < cursor_key)
+            query = query.order_by(MessagesOrm.created_at.desc(), MessagesOrm.id.desc())
+        query = query.limit(cursor_params.size + 1)
+
+        result = await session.execute(query)
+        messages: list[MessagesOrm] = list(result.scalars().all())
+        has_more = len(messages) > cursor_params.size
+        messages = messages[:cursor_params.size]
+        logger.log(
+            'DB_ACCESS',
+            f'Data retrieve: model={self.model.__name__}, t_id={employee_id}, {len(messages)} entries retrieved',
+        )
+
+        # Страница всегда отдается в хронологическом порядке
+        if cursor_params.after is not None:
+            prev_cursor = messages[0].id if messages else None
+        else:
+            messages.reverse()
+            prev_cursor = messages[0].id if messages and has_more else None
+        # next_cursor пригоден для опроса новых сообщений, даже если их пока нет
+        next_cursor = messages[-1].id if messages else cursor_id
+
+        employee.messages = {
+            'items': messages,
+            'size': cursor_params.size,
+            'prev_cursor': prev_cursor,
+            'next_cursor': next_cursor,
+        }
+        return EmployeeChatCursorSchema.model_validate(employee)
+
+    def stream_history_csv(self, employee_id: int | None = None) -> AsyncIterator[str]:
+        """Выгружаем историю сообщений в CSV потоком, все чаты или чат одного сотрудника."""
+        # to_dict выводит имена сотрудника и менеджера
+        query = (
+            select(MessagesOrm)
+            .options(joinedload(MessagesOrm.employee), joinedload(MessagesOrm.manager))
+            .order_by(MessagesOrm.id)
+        )
+        if employee_id is not None:
+            query = query.where(MessagesOrm.employee_id == employee_id)
+        return self.stream_csv(query)
+
 
 messages_service = MessagesService()
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, status
-from fastapi_pagination import Params
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Page, Params
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_async_session
+from messages.delivery import delivery_service
 from messages.models import EmployeesOrm, MessagesOrm
 from messages.schemas import (
+    ChatCursorParams,
+    DeliveryStatsSchema,
+    EmployeeBansVersionSchema,
     EmployeeChangeSchema,
+    EmployeeChatCursorSchema,
     EmployeeChatListSchema,
     EmployeeChatSchema,
     EmployeeCreareSchema,
@@ -14,7 +20,7 @@ from messages.schemas import (
     MessageReadSchema,
 )
 from messages.service import employee_service, messages_service
-from messages.utils import send_telegram_message
+from utils import csv_streaming_response
 
 messages_router = APIRouter()
 
@@ -33,6 +39,19 @@ async def create_or_get_employee(
     return new_employee
 
 
+@messages_router.get(
+    '/employees/bans/version',
+    response_model=EmployeeBansVersionSchema,
+    summary='Получить версию списка блокировок',
+)
+async def get_bans_version(
+    session: AsyncSession = Depends(get_async_session),
+) -> EmployeeBansVersionSchema:
+    """Получаем версию списка заблокированных сотрудников."""
+    version = await employee_service.get_bans_version(session)
+    return EmployeeBansVersionSchema(version=version)
+
+
 @messages_router.get(
     '/employees/{employee_id}',
     response_model=EmployeeReadSchema,
@@ -48,14 +67,20 @@ async def get_employee(
 
 @messages_router.get(
     '/employees/',
-    response_model=list[EmployeeChatListSchema],
+    response_model=Page[EmployeeChatListSchema],
     summary='Получить список сотрудников (чатов)',
 )
 async def get_employees(
+    unread: bool | None = None,
+    is_banned: bool | None = None,
+    name: str | None = None,
+    page_params: Params = Depends(),
     session: AsyncSession = Depends(get_async_session),
-) -> list[EmployeeChatListSchema]:
-    """Получаем чаты с сотрудниками."""
-    employees = await employee_service.get_employees_chat_list(session)
+) -> Page[EmployeeChatListSchema]:
+    """Получаем страницу чатов с сотрудниками с учетом фильтров."""
+    employees = await employee_service.get_employees_chat_list(
+        session, unread, is_banned, name, page_params
+    )
     return employees
 
 
@@ -82,14 +107,11 @@ async def change_employee(
 )
 async def create_message(
     new_message: MessageCreateSchema,
-    backgorund_task: BackgroundTasks,
     session: AsyncSession = Depends(get_async_session),
 ) -> MessageReadSchema:
     """Создаем новое сообщение пользователя или менеджера."""
     new_message: MessagesOrm = await messages_service.create_message(session, new_message)
-    # Для отправки ответов менеджера создаем фоновую задачу
-    if new_message.manager_id is not None:
-        backgorund_task.add_task(send_telegram_message, new_message.employee_id, new_message.text)
+    # Ответы менеджера доставляет обработчик outbox, задание записано вместе с сообщением
     return new_message
 
 
@@ -108,6 +130,23 @@ async def get_employee_chat(
     return employee_chat
 
 
+@messages_router.get(
+    '/employees/{employee_id}/chat/cursor',
+    response_model=EmployeeChatCursorSchema,
+    summary='Получить чат с сотрудником по курсору',
+)
+async def get_employee_chat_by_cursor(
+    employee_id: int,
+    cursor_params: ChatCursorParams = Depends(),
+    session: AsyncSession = Depends(get_async_session),
+) -> EmployeeChatCursorSchema:
+    """Получаем последние сообщения чата либо сообщения до/после указанного."""
+    employee_chat = await messages_service.get_employee_chat_by_cursor(
+        session, employee_id, cursor_params
+    )
+    return employee_chat
+
+
 @messages_router.post(
     '/employees/{employee_id}/chat/mark_as_read',
     status_code=status.HTTP_204_NO_CONTENT,
@@ -118,3 +157,24 @@ async def mark_employee_chat_as_read(
 ) -> None:
     """Помечаем чат прочитанным."""
     await messages_service.mark_chat_as_read(session, employee_id)
+
+
+@messages_router.get(
+    '/delivery/stats',
+    response_model=DeliveryStatsSchema,
+    summary='Получить метрики доставки сообщений',
+)
+async def get_delivery_stats() -> DeliveryStatsSchema:
+    """Получаем метрики очереди доставки ответов в Telegram."""
+    return delivery_service.get_stats()
+
+
+@messages_router.get(
+    '/export',
+    response_class=StreamingResponse,
+    summary='Выгрузить историю сообщений в CSV',
+)
+async def export_messages(employee_id: int | None = None) -> StreamingResponse:
+    """Выгружаем историю сообщений потоком, без загрузки всей таблицы в память."""
+    filename = f'messages_{employee_id}.csv' if employee_id else 'messages.csv'
+    return csv_streaming_response(messages_service.stream_history_csv(employee_id), filename)
@@ -1,6 +1,7 @@
-from auth.models import SessionsOrm  # noqa
+from auth.models import SessionRevocationsOrm, SessionsOrm  # noqa
 from bot_settings.models import BotSettingsOrm  # noqa
 from database import AppBaseClass  # noqa
 from users.models import RolesOrm, UsersOrm  # noqa
-from messages.models import MessagesOrm, EmployeesOrm  # noqa
+from messages.models import ChatSummaryOrm, MessagesOrm, MessageOutboxOrm, EmployeesOrm  # noqa
 from menu.models import MenuOrm  # noqa
+from snapshots.models import DataSnapshotOrm  # noqa
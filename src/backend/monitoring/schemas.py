@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class DbPoolStatsSchema(BaseModel):
+    """Класс состояния пула соединений с БД."""
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout: int
+    pgbouncer_mode: bool
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from database import get_pool_stats
+from monitoring.schemas import DbPoolStatsSchema
+
+monitoring_router = APIRouter()
+
+
+@monitoring_router.get(
+    '/db_pool',
+    response_model=DbPoolStatsSchema,
+    summary='Получить состояние пула соединений с БД',
+)
+async def get_db_pool_stats(replica: bool = False) -> DbPoolStatsSchema:
+    """Эндпоинт состояния пула: сколько соединений занято, свободно и открыто сверх размера пула."""
+    return DbPoolStatsSchema(**get_pool_stats(replica))
@@ -0,0 +1,20 @@
+import asyncio
+
+from database import AsyncSessionLocal
+from log import logger
+from models import ChatSummaryOrm, EmployeesOrm, MessagesOrm  # noqa
+from messages.service import chat_summary_service
+
+
+async def rebuild_chat_summary() -> None:
+    """Пересобираем сводку по чатам из таблицы сообщений, печатаем в лог число чатов."""
+    async with AsyncSessionLocal() as session:
+        try:
+            count: int = await chat_summary_service.rebuild(session)
+            logger.info(f'Chat summary was rebuilt, {count} chats in total')
+        except Exception as e:
+            logger.error(f'Error while rebuilding chat summary: {e}')
+
+
+if __name__ == '__main__':
+    asyncio.run(rebuild_chat_summary())
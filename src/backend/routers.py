@@ -1,9 +1,11 @@
 from fastapi import APIRouter
 
 from auth.views import auth_router
+from bot_context.views import bot_context_router
 from bot_settings.views import botsettings_router
 from menu.views import menu_router
 from messages.views import messages_router
+from monitoring.views import monitoring_router
 from users.views import users_router
 
 main_router = APIRouter(prefix='/bot/api')
@@ -13,3 +15,5 @@ main_router.include_router(users_router, prefix='/users', tags=['users'])
 main_router.include_router(auth_router, prefix='/auth/sessions', tags=['auth'])
 main_router.include_router(messages_router, prefix='/messages', tags=['messages'])
 main_router.include_router(menu_router, prefix='/menu', tags=['menu'])
+main_router.include_router(bot_context_router, prefix='/bot/context', tags=['bot'])
+main_router.include_router(monitoring_router, prefix='/monitoring', tags=['monitoring'])
@@ -0,0 +1,4 @@
+SNAPSHOT_TABLE_NAME_MAX_LENGTH = 64
+SNAPSHOTS_KEEP_PER_TABLE = 10
+
+ERROR_MESSAGE_SNAPSHOT_NOT_FOUND = 'Нет сохраненной копии данных для восстановления'
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database import AppBaseClass
+from snapshots.constants import SNAPSHOT_TABLE_NAME_MAX_LENGTH
+
+
+class DataSnapshotOrm(AppBaseClass):
+    """Модель копий данных таблиц, снимаемых перед загрузкой из файла."""
+
+    __tablename__ = 'data_snapshot'
+
+    table_name: Mapped[str] = mapped_column(
+        String(SNAPSHOT_TABLE_NAME_MAX_LENGTH), nullable=False, index=True
+    )
+    payload: Mapped[list] = mapped_column(JSONB, nullable=False)
+    rows_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False
+    )
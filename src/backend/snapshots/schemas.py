@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SnapshotReadSchema(BaseModel):
+    """Класс представления копии данных таблицы."""
+    id: int
+    table_name: str
+    rows_count: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
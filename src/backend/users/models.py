@@ -32,7 +32,7 @@ class RolesOrm(AppBaseClass):
         Boolean, default=False, server_default=text('false'), nullable=False
     )
 
-    user: Mapped[list['UsersOrm']] = relationship('UsersOrm', back_populates='role')
+    user: Mapped[list['UsersOrm']] = relationship('UsersOrm', back_populates='role', lazy='raise')
 
     __order_by__ = (name.asc(),)
 
@@ -59,20 +59,19 @@ class UsersOrm(AppBaseClass):
     updated_by_id: Mapped[int] = mapped_column(
         Integer, ForeignKey('auth_user.id', ondelete='SET NULL'), nullable=True)
 
+    # Связи не загружаются неявно: сервисы указывают нужные им связи в options запроса
     role: Mapped[RolesOrm] = relationship(
-        'RolesOrm', back_populates='user', lazy='joined')
+        'RolesOrm', back_populates='user', lazy='raise')
 
     session: Mapped['SessionsOrm'] = relationship(  # noqa: F821 # pyright: ignore[reportUndefinedVariable]
-        'SessionsOrm', back_populates='user')
+        'SessionsOrm', back_populates='user', lazy='raise')
 
     created_by: Mapped['UsersOrm'] = relationship(
         'UsersOrm',
         foreign_keys=[
             created_by_id,
         ],
-        lazy='joined',
-        # Если не ограничить глубину, можно запустить бескочненый цикл жадной загрузки
-        join_depth=1,
+        lazy='raise',
         # Черная магия, но иначе отношение будет работать в обе стороны
         # Без лямбды UsersOrm не определено к этому моменту
         remote_side=lambda: [UsersOrm.id],
@@ -83,8 +82,7 @@ class UsersOrm(AppBaseClass):
         foreign_keys=[
             updated_by_id,
         ],
-        lazy='joined',
-        join_depth=1,
+        lazy='raise',
         remote_side=lambda: [UsersOrm.id],
     )
 
@@ -1,10 +1,18 @@
+from typing import Sequence
+
+from auth.cache import session_cache
+from auth.constants import AUTH_SESSION_MODE_TOKEN
+from auth.revocation import revocation_list
 from base_service import BaseService
+from config import settings
 from fastapi import HTTPException, status
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import paginate
 from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.interfaces import LoaderOption
 from users.constants import ERROR_MESSAGE_USERNAME_TAKEN, ERROR_MESSAGE_WRONG_LOGIN_DATA
 from users.models import RolesOrm, UsersOrm
 from users.schemas import (
@@ -12,6 +20,15 @@ from users.schemas import (
     UserUpdateSchema,
 )
 
+# Связи для проверки полномочий пользователя
+USER_ROLE_OPTIONS = (joinedload(UsersOrm.role),)
+# Связи для схемы UserReadSchema
+USER_READ_OPTIONS = (
+    joinedload(UsersOrm.role),
+    joinedload(UsersOrm.created_by),
+    joinedload(UsersOrm.updated_by),
+)
+
 
 class RoleService(BaseService):
     """Класс сервисный функций модели."""
@@ -24,6 +41,8 @@ role_service = RoleService()
 
 class UserService(BaseService):
     """Класс сервисный функций модели."""
+    loader_options = USER_READ_OPTIONS
+
     def __init__(self) -> None:
         super().__init__(UsersOrm)
 
@@ -47,7 +66,12 @@ class UserService(BaseService):
         if name is not None:
             filters.append(UsersOrm.username.ilike(f'%{name}%'))
 
-        query = select(self.model).filter(*filters).order_by(*self.model.__order_by__)
+        query = (
+            select(self.model)
+            .options(*self.loader_options)
+            .filter(*filters)
+            .order_by(*self.model.__order_by__)
+        )
         # Пагинация результата
         result: Page = await paginate(session, query, page_params)
         logger.log(
@@ -60,9 +84,10 @@ class UserService(BaseService):
         self,
         session: AsyncSession,
         username: str,
+        options: Sequence[LoaderOption] = (),
     ) -> UsersOrm | None:
         """Ищем пользователя по имени."""
-        query = select(UsersOrm).where(UsersOrm.username == username)
+        query = select(UsersOrm).where(UsersOrm.username == username).options(*options)
         user = await session.execute(query)
         user = user.scalars().first()
         logger.log(
@@ -101,9 +126,10 @@ class UserService(BaseService):
         self,
         session: AsyncSession,
         user_id: int,
+        options: Sequence[LoaderOption] | None = None,
     ) -> UsersOrm:
         """Получаем одну настройку проекта."""
-        user: UsersOrm | None = await self.get(session, user_id)
+        user: UsersOrm | None = await self.get(session, user_id, options)
 
         if user is None:
             raise HTTPException(
@@ -120,7 +146,7 @@ class UserService(BaseService):
         # Валидируем данные в БД. Это Pydantic не проверяет
         await self.is_username_available(session, data_input.username)
         await role_service.get(session, data_input.role_id)
-        await self.get(session, data_input.created_by_id)
+        await self.get(session, data_input.created_by_id, options=())
         data_input.updated_by_id = data_input.created_by_id
         new_user = await self.create(session, data_input)
         return new_user
@@ -133,8 +159,21 @@ class UserService(BaseService):
         if hasattr(data_input, 'role_id') and data_input.role_id is not None:
             await role_service.get(session, data_input.role_id)
 
-        user: UsersOrm = await self.get_user(session, user_id)
+        user: UsersOrm = await self.get_user(session, user_id, options=())
+        # Роль и активность записаны в подписанных токенах, при их изменении токены отзываем
+        revoke_tokens = (
+            data_input.role_id is not None and data_input.role_id != user.role_id
+        ) or (data_input.is_active is False and user.is_active)
+        revoked_at: float | None = None
+        if revoke_tokens and settings.AUTH_SESSION_MODE == AUTH_SESSION_MODE_TOKEN:
+            # Отзыв фиксируется в одной транзакции с изменением пользователя
+            revoked_at = revocation_list.revoke_user(session, user_id)
+
         user = await self.update(session, user, data_input)
+        if revoked_at is not None:
+            revocation_list.apply_user_revocation(user_id, revoked_at)
+        # Активность и роль пользователя хранятся в кэше сессий
+        session_cache.invalidate_user(user_id)
 
         return user
 
@@ -1,22 +1,53 @@
+from typing import AsyncIterator
+
 import aiofiles
-from aiocsv import AsyncDictReader, AsyncWriter
+from aiocsv import AsyncDictReader
+from fastapi import status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from base_schemas import UploadReportSchema
 
 
-async def read_csv(filepath: str) -> list[dict]:
-    """Читаем данные из CSV-файла."""
-    data = []
+async def read_csv_chunks(filepath: str, chunk_size: int) -> AsyncIterator[list[dict]]:
+    """Читаем данные из CSV-файла частями, не загружая файл в память целиком."""
+    chunk = []
     async with aiofiles.open(
         filepath, mode='r', encoding='utf-8-sig', newline=''
     ) as csvfile:
         async for row in AsyncDictReader(csvfile, delimiter=';'):
-            data.append(row)
-    return data
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
 
 
-async def write_csv(data: list[tuple], filepath: str) -> None:
-    """Записываем данные в CSV-файл."""
-    async with aiofiles.open(
-        filepath, mode='w', encoding='utf-8-sig', newline=''
-    ) as csvfile:
-        writer = AsyncWriter(csvfile, delimiter=';')
-        await writer.writerows(data)
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверяем заголовок If-None-Match на совпадение с текущим ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # Слабые валидаторы сравниваем без префикса W/
+    candidates = [el.strip().removeprefix('W/') for el in if_none_match.split(',')]
+    return etag in candidates
+
+
+def upload_report_response(report: UploadReportSchema) -> UploadReportSchema | JSONResponse:
+    """Отчет о загрузке файла; при ошибках - ответ 422 с кратким описанием в detail."""
+    if report.is_success:
+        return report
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={'detail': report.summary(), **report.model_dump()},
+    )
+
+
+def csv_streaming_response(stream: AsyncIterator[str], filename: str) -> StreamingResponse:
+    """Ответ с CSV-файлом, который отдается клиенту по мере чтения из БД."""
+    return StreamingResponse(
+        stream,
+        media_type='text/csv; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
@@ -48,18 +48,52 @@ class Settings(BaseSettings):
     SETTINGS_UPDATE_DELAY: int = 10
     MESSAGE_MAX_LENGTH: int = 2048
 
-    # Число попыток получить данные с бэкенда, интервал между попытками
+    # Число попыток получить данные с бэкенда, база и потолок экспоненциальной задержки между попытками
     API_CONNECTION_ATTEMPTS: int = 3
-    TIMEOUT: float = 0.3
+    API_BACKOFF_BASE: float = 0.1
+    API_BACKOFF_MAX: float = 1.0
+
+    # Автомат защиты эндпоинта: число ошибок подряд до размыкания и время до пробного запроса
+    API_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    API_CIRCUIT_RECOVERY_TIMEOUT: float = 15
+    # Как часто писать состояние автоматов защиты в лог, в секундах
+    CIRCUIT_STATE_LOG_INTERVAL: int = 60
+
+    # Параметры общего пула соединений с бэкендом
+    API_CONNECTIONS_LIMIT: int = 100
+    API_CONNECTIONS_LIMIT_PER_HOST: int = 30
+    API_KEEPALIVE_TIMEOUT: float = 30
+    API_DNS_CACHE_TTL: int = 300
+    API_CONNECT_TIMEOUT: float = 2
+    API_REQUEST_TIMEOUT: float = 5
+
+    # Кэш известных сотрудников: максимальный размер и время жизни записи в секундах
+    EMPLOYEE_CACHE_MAX_SIZE: int = 10000
+    EMPLOYEE_CACHE_TTL: int = 600
 
     ERROR_CONNECTION_TO_BACKEND_API: str = 'Ошибка подключения. Повторите попытку позже'
 
+    # Хранилище состояний FSM: memory (один процесс), redis (несколько реплик) или sqlite (тесты)
+    FSM_STORAGE: str = os.getenv('HRBOT_FSM_STORAGE', 'memory').lower()
+    REDIS_URL: str = os.getenv('HRBOT_REDIS_URL', 'redis://localhost:6379/0')
+    FSM_SQLITE_PATH: str = os.getenv('HRBOT_FSM_SQLITE_PATH', 'fsm.sqlite3')
+    # Время жизни брошенного состояния в секундах
+    FSM_STATE_TTL: int = 24 * 60 * 60
+
     # Настройки для вебхуков
+    USE_WEBHOOK: bool = os.getenv('HRBOT_USE_WEBHOOK', 'False').lower() in ('true', '1')
     WEBHOOK_SECRET: str = os.getenv('HRBOT_WEBHOOK_SECRET')
     WEB_SERVER_HOST: str = os.getenv('HRBOT_WEB_SERVER_HOST')
     WEB_SERVER_PORT: int = os.getenv('HRBOT_WEB_SERVER_PORT')
     WEBHOOK_PATH: str = os.getenv('HRBOT_WEBHOOK_PATH')
     BASE_WEBHOOK_URL: str = os.getenv('HRBOT_BASE_WEBHOOK_URL')
+    # Число одновременных соединений Telegram с вебхуком
+    WEBHOOK_MAX_CONNECTIONS: int = 40
+    # Число одновременно обрабатываемых и принятых в очередь апдейтов
+    WEBHOOK_MAX_CONCURRENT_UPDATES: int = 50
+    WEBHOOK_MAX_PENDING_UPDATES: int = 1000
+    # Сколько секунд ждать обработки принятых апдейтов при остановке
+    WEBHOOK_SHUTDOWN_TIMEOUT: float = 30
 
 
 class BotSettings(Settings):
@@ -0,0 +1,107 @@
+import time
+from collections import OrderedDict
+from math import ceil
+
+from config import settings as s
+from core.log import logger
+from core.service import api_client
+
+
+class MenuCache:
+    """Снимок справочника меню в памяти бота."""
+
+    def __init__(self) -> None:
+        self.version: str | None = None
+        self._items: list[dict] = []
+        self._items_by_id: dict[int, dict] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        """Снимок справочника хотя бы раз загружен с бэкенда."""
+        return self.version is not None
+
+    def load(self, snapshot: dict) -> None:
+        """Заменяем снимок справочника целиком."""
+        self._items = snapshot['items']
+        self._items_by_id = {el['id']: el for el in self._items}
+        self.version = snapshot['version']
+        logger.info(f'📚 Menu snapshot {self.version} loaded, {len(self._items)} items')
+
+    async def refresh(self) -> None:
+        """Перезагружаем снимок, только если на бэкенде появилась новая версия."""
+        version: str | None = await api_client.get_menu_version()
+        if version is None or version == self.version:
+            return
+
+        snapshot: dict | None = await api_client.get_menu_snapshot()
+        if snapshot:
+            self.load(snapshot)
+
+    def get_page(self, page: int, size: int) -> dict:
+        """Собираем страницу справочника в формате пагинации бэкенда."""
+        total = len(self._items)
+        start = (page - 1) * size
+        return {
+            'items': self._items[start:start + size],
+            'total': total,
+            'page': page,
+            'size': size,
+            'pages': ceil(total / size) if size else 0,
+        }
+
+    def get_item(self, menu_item_id: int) -> dict | None:
+        """Получаем элемент справочника по id."""
+        return self._items_by_id.get(menu_item_id)
+
+
+menu_cache = MenuCache()
+
+
+class EmployeeCache:
+    """Ограниченный по размеру кэш известных сотрудников и их блокировок с TTL."""
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.bans_version: str | None = None
+        # id сотрудника -> (флаг блокировки, момент устаревания записи)
+        self._entries: OrderedDict[int, tuple[bool, float]] = OrderedDict()
+
+    def get(self, employee_id: int) -> bool | None:
+        """Получаем флаг блокировки сотрудника, None - сотрудник неизвестен."""
+        entry = self._entries.get(employee_id)
+        if entry is None:
+            return None
+
+        is_banned, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[employee_id]
+            return None
+
+        self._entries.move_to_end(employee_id)
+        return is_banned
+
+    def set(self, employee_id: int, is_banned: bool) -> None:
+        """Запоминаем сотрудника, вытесняя самые давние записи."""
+        self._entries[employee_id] = (is_banned, time.monotonic() + self.ttl)
+        self._entries.move_to_end(employee_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Сбрасываем кэш целиком."""
+        self._entries.clear()
+
+    async def refresh(self) -> None:
+        """Сбрасываем кэш, если на бэкенде изменился список блокировок."""
+        version: str | None = await api_client.get_bans_version()
+        if version is None or version == self.bans_version:
+            return
+
+        if self.bans_version is not None:
+            self.clear()
+            logger.info(f'🚫 Bans version changed to {version}, employee cache cleared')
+        self.bans_version = version
+
+
+employee_cache = EmployeeCache(s.EMPLOYEE_CACHE_MAX_SIZE, s.EMPLOYEE_CACHE_TTL)
@@ -1,11 +1,13 @@
 from aiogram import Dispatcher
 
+from core.storage import build_storage
 from handlers.help import help_router
 from handlers.menu import menu_router
 from handlers.message import message_router
 from handlers.start import start_router
 
-dispatcher = Dispatcher()
+# Общее хранилище состояний позволяет запускать несколько реплик бота
+dispatcher = Dispatcher(storage=build_storage())
 
 dispatcher.include_router(help_router)
 dispatcher.include_router(menu_router)
@@ -8,8 +8,10 @@ from aiogram.types.update import Update
 
 from config import BotSettings
 from config import settings as s
+from core.cache import employee_cache, menu_cache
 from core.dispatcher import dispatcher
 from core.service import ApiClientException, api_client
+from core.startup import refresh_requested
 
 
 def _extract_object_from_update(update: Update) -> tuple[Message | CallbackQuery, Chat]:
@@ -86,16 +88,44 @@ async def employee_check_middleware(
     event_object, _ = _extract_object_from_update(event)
     event_object: Message | CallbackQuery
 
-    if event_object.from_user is not None:
+    if event_object.from_user is None:
+        await event_object.answer(bs.ERROR_USER_NOT_FOUND)
+        return None
+
+    employee_id = event_object.from_user.id
+
+    # Известного сотрудника проверяем по кэшу, без обращения к бэкенду
+    is_banned: bool | None = employee_cache.get(employee_id)
+
+    if is_banned is None:
+        # Неизвестного сотрудника регистрируем и заодно получаем версии данных одним запросом
         try:
-            employee: dict | None = await api_client.get_or_create_employee(
-                event_object.from_user.id, event_object.from_user.full_name
+            bot_context: dict | None = await api_client.get_bot_context(
+                employee_id, event_object.from_user.full_name, bs.MENU_BUTTONS_PER_PAGE
             )
         except ApiClientException:
             await event_object.answer(bs.ERROR_CONNECTION_TO_BACKEND_API)
             return None
 
-    if not employee:
+        if not bot_context:
+            await event_object.answer(bs.ERROR_USER_NOT_FOUND)
+            return None
+
+        is_banned = bot_context['employee']['is_banned']
+        employee_cache.set(employee_id, is_banned)
+
+        # Данные бота устарели - обновляем их вне очереди, не дожидаясь таймера
+        settings_etag = f'"{bot_context["settings_version"]}"'
+        if (
+            settings_etag != dispatcher.workflow_data.get('settings_etag')
+            or bot_context['menu_version'] != menu_cache.version
+        ):
+            refresh_requested.set()
+
+        # Первая страница меню пригодится хэндлеру, пока снимок справочника не загружен
+        data['menu_page'] = bot_context['menu_page']
+
+    if is_banned:
         await event_object.answer(bs.ERROR_USER_NOT_FOUND)
         return None
 
@@ -0,0 +1,78 @@
+import random
+import time
+from enum import Enum
+
+from core.log import logger
+
+
+class CircuitState(str, Enum):
+    """Состояния автомата защиты."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Автомат защиты для одного эндпоинта бэкенда."""
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_started_at: float | None = None
+
+    def allow_request(self) -> bool:
+        """Решаем, можно ли сейчас обращаться к эндпоинту."""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            # Время восстановления вышло - пропускаем один пробный запрос
+            self.state = CircuitState.HALF_OPEN
+            logger.info(f'🔶 Circuit {self.name} is half-open, trying the backend again')
+
+        if self.state == CircuitState.HALF_OPEN:
+            # Пробный запрос уже идет; зависший или отмененный пробный запрос не блокирует цепь навсегда
+            now = time.monotonic()
+            if self._trial_started_at is not None and now - self._trial_started_at < self.recovery_timeout:
+                return False
+            self._trial_started_at = now
+
+        return True
+
+    def record_success(self) -> None:
+        """Успешный вызов замыкает цепь и сбрасывает счетчик ошибок."""
+        if self.state != CircuitState.CLOSED:
+            logger.info(f'🟢 Circuit {self.name} is closed')
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        """Неуспешный вызов; при превышении порога цепь размыкается."""
+        self.failures += 1
+        self._trial_started_at = None
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                logger.warning(f'🔴 Circuit {self.name} is open after {self.failures} failures')
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def to_dict(self) -> dict:
+        """Состояние автомата для мониторинга."""
+        return {
+            'state': self.state.value,
+            'failures': self.failures,
+            'opened_seconds_ago': (
+                round(time.monotonic() - self.opened_at, 1) if self.opened_at is not None else None
+            ),
+        }
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Экспоненциальная задержка перед повтором с полным случайным разбросом."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
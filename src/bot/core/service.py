@@ -1,11 +1,20 @@
 import asyncio
+from functools import wraps
 from http import HTTPStatus
 from typing import Any, Callable
 
-from aiohttp import ClientSession
+from aiohttp import (
+    ClientConnectionError,
+    ClientConnectorError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
 
 from config import settings as s
 from core.log import logger
+from core.resilience import CircuitBreaker, backoff_delay
 
 
 class ApiClientException(Exception):
@@ -13,109 +22,245 @@ class ApiClientException(Exception):
     pass
 
 
+class BackendServerError(Exception):
+    """Бэкенд ответил ошибкой 5xx."""
+    pass
+
+
+# Ошибки, после которых повтор безопасен для любого запроса: запрос не дошел до бэкенда
+CONNECTION_ERRORS = (ClientConnectorError,)
+# Ошибки, после которых повторяем только идемпотентные запросы
+TRANSIENT_ERRORS = (ClientConnectionError, asyncio.TimeoutError, BackendServerError)
+
+
 class ApiClient:
     """Класс функций api-клиента."""
     API_URL = f'{s.API_HOST}:{s.API_PORT}{s.API_PREFIX}'
 
+    def __init__(self) -> None:
+        self._session: ClientSession | None = None
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    async def start(self) -> None:
+        """Создаем общую сессию с пулом соединений до бэкенда."""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = TCPConnector(
+            limit=s.API_CONNECTIONS_LIMIT,
+            limit_per_host=s.API_CONNECTIONS_LIMIT_PER_HOST,
+            keepalive_timeout=s.API_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=s.API_DNS_CACHE_TTL,
+        )
+        timeout = ClientTimeout(
+            total=s.API_REQUEST_TIMEOUT,
+            sock_connect=s.API_CONNECT_TIMEOUT,
+        )
+        self._session = ClientSession(connector=connector, timeout=timeout)
+        logger.info('🔌 Backend API client session started')
+
+    async def close(self) -> None:
+        """Закрываем общую сессию и соединения пула."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info('🔌 Backend API client session closed')
+        self._session = None
+
+    @property
+    def session(self) -> ClientSession:
+        """Общая сессия api-клиента, должна быть создана на старте бота."""
+        if self._session is None or self._session.closed:
+            raise ApiClientException('API client session is not started')
+        return self._session
+
+    def _get_breaker(self, endpoint: str) -> CircuitBreaker:
+        """Автомат защиты конкретного эндпоинта, создается при первом вызове."""
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_threshold=s.API_CIRCUIT_FAILURE_THRESHOLD,
+                recovery_timeout=s.API_CIRCUIT_RECOVERY_TIMEOUT,
+            )
+        return self._breakers[endpoint]
+
+    def get_circuit_states(self) -> dict[str, dict]:
+        """Состояние автоматов защиты всех эндпоинтов для мониторинга."""
+        return {name: breaker.to_dict() for name, breaker in self._breakers.items()}
+
     @staticmethod
-    def timeout_decorator(func: Callable) -> Callable:
-        """Функция-декоратор для повторного вызова API-сервера."""
-
-        async def wrapper(*args, **kwargs) -> Any:
-            """Функция повтора запроса с промежутком."""
-            result = None
-            for _ in range(s.API_CONNECTION_ATTEMPTS):
-                try:
-                    result = await func(*args, **kwargs)
-                    return result
-                except Exception:
-                    pass
-                await asyncio.sleep(s.TIMEOUT)
-            # Если за указанное число попыток данные загрузить не удалось...
-            if not result:
+    def _raise_for_server_error(response: ClientResponse) -> None:
+        """Ошибки 5xx считаем сбоем бэкенда, а не штатным ответом."""
+        if response.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            raise BackendServerError(f'Backend responded with status {response.status}')
+
+    @staticmethod
+    def resilient(idempotent: bool = True) -> Callable:
+        """Функция-декоратор: повторы с экспоненциальной задержкой и автомат защиты эндпоинта."""
+        retry_on = TRANSIENT_ERRORS if idempotent else CONNECTION_ERRORS
+
+        def decorator(func: Callable) -> Callable:
+
+            @wraps(func)
+            async def wrapper(self: 'ApiClient', *args, **kwargs) -> Any:
+                """Функция повтора запроса, пока цепь эндпоинта замкнута."""
+                breaker = self._get_breaker(func.__name__)
+
+                # Пока цепь разомкнута, бэкенд не нагружаем и сразу возвращаем ошибку
+                if not breaker.allow_request():
+                    raise ApiClientException(s.ERROR_CONNECTION_TO_BACKEND_API)
+
+                for attempt in range(s.API_CONNECTION_ATTEMPTS):
+                    try:
+                        result = await func(self, *args, **kwargs)
+                    except retry_on as e:
+                        logger.warning(f'Request {func.__name__} failed, attempt {attempt + 1}: {e!r}')
+                        if attempt + 1 < s.API_CONNECTION_ATTEMPTS:
+                            await asyncio.sleep(
+                                backoff_delay(attempt, s.API_BACKOFF_BASE, s.API_BACKOFF_MAX)
+                            )
+                    except Exception as e:
+                        # Повтор не безопасен или бессмысленен
+                        breaker.record_failure()
+                        logger.error(f'Request {func.__name__} failed: {e!r}')
+                        raise ApiClientException(s.ERROR_CONNECTION_TO_BACKEND_API) from e
+                    else:
+                        breaker.record_success()
+                        return result
+
+                # Если за указанное число попыток данные загрузить не удалось...
+                breaker.record_failure()
                 logger.error(s.ERROR_CONNECTION_TO_BACKEND_API)
                 raise ApiClientException(s.ERROR_CONNECTION_TO_BACKEND_API)
 
-            return None
+            return wrapper
 
-        return wrapper
+        return decorator
 
-    @timeout_decorator
-    async def get_settings(self) -> dict | None:
-        """Получить список настроек от бэкенда."""
+    @resilient(idempotent=True)
+    async def get_settings(self, etag: str | None = None) -> tuple[dict | None, str | None]:
+        """Получить список настроек от бэкенда, если они изменились с версии etag."""
         url = f'{self.API_URL}/settings/'
+        headers = {'If-None-Match': etag} if etag else None
+
+        async with self.session.get(url, headers=headers) as response:
+            logger.log(
+                'API_REQUEST', f'Request to {url}, reponse status {response.status}'
+            )
+            self._raise_for_server_error(response)
+            # Настройки не изменились - повторно не разбираем
+            if response.status == HTTPStatus.NOT_MODIFIED:
+                return None, etag
+            if response.status == HTTPStatus.OK:
+                result = await response.json()
+                # Преобразуем список в словарь ключ-значение
+                result = {el['name']: el['value'] for el in result}
+                return result, response.headers.get('ETag')
+            return None, etag
 
-        async with ClientSession() as session:
-            async with session.get(url) as response:
-                logger.log(
-                    'API_REQUEST', f'Request to {url}, reponse status {response.status}'
-                )
-                if response.status == HTTPStatus.OK:
-                    result = await response.json()
-                    # Преобразуем список в словарь ключ-значение
-                    result = {el['name']: el['value'] for el in result}
-                    return result
-                return None
-
-    @timeout_decorator
+    @resilient(idempotent=True)
     async def get_menu_page(self, page: int = 1, size: int = 4) -> dict | None:
         """Получить список элементов меню от бэкенда."""
         url = f'{self.API_URL}/menu/?page={page}&size={size}'
 
-        async with ClientSession() as session:
-            async with session.get(url) as response:
-                logger.log(
-                    'API_REQUEST', f'Request to {url}, reponse status {response.status}'
-                )
-                if response.status == HTTPStatus.OK:
-                    result = await response.json()
-                    return result
-                return None
-
-    @timeout_decorator
+        async with self.session.get(url) as response:
+            logger.log(
+                'API_REQUEST', f'Request to {url}, reponse status {response.status}'
+            )
+            self._raise_for_server_error(response)
+            if response.status == HTTPStatus.OK:
+                result = await response.json()
+                return result
+            return None
+
+    @resilient(idempotent=True)
     async def get_menu_item(self, menu_item_id: int) -> dict | None:
         """Получить элемент меню от бэкенда."""
         url = f'{self.API_URL}/menu/{menu_item_id}'
 
-        async with ClientSession() as session:
-            async with session.get(url) as response:
-                logger.log(
-                    'API_REQUEST', f'Request to {url}, reponse status {response.status}'
-                )
-                if response.status == HTTPStatus.OK:
-                    result = await response.json()
-                    return result
-                return None
-
-    @timeout_decorator
-    async def get_or_create_employee(self, employee_id: int, name: str) -> dict | None:
-        """Получить сотрудника бэкенда."""
-        url = f'{self.API_URL}/messages/employees/'
-        data = {'id': employee_id, 'name': name}
-
-        async with ClientSession() as session:
-            async with session.post(url, json=data) as response:
-                logger.log(
-                    'API_REQUEST',
-                    f'Request to {url} with {data}, reponse status {response.status}',
-                )
-                if response.status in (HTTPStatus.CREATED, HTTPStatus.OK):
-                    result = await response.json()
-                    return result
-                return None
-
-    @timeout_decorator
+        async with self.session.get(url) as response:
+            logger.log(
+                'API_REQUEST', f'Request to {url}, reponse status {response.status}'
+            )
+            self._raise_for_server_error(response)
+            if response.status == HTTPStatus.OK:
+                result = await response.json()
+                return result
+            return None
+
+    @resilient(idempotent=True)
+    async def get_menu_version(self) -> str | None:
+        """Получить текущую версию справочника от бэкенда."""
+        url = f'{self.API_URL}/menu/version'
+
+        async with self.session.get(url) as response:
+            logger.log(
+                'API_REQUEST', f'Request to {url}, reponse status {response.status}'
+            )
+            self._raise_for_server_error(response)
+            if response.status == HTTPStatus.OK:
+                result = await response.json()
+                return result['version']
+            return None
+
+    @resilient(idempotent=True)
+    async def get_menu_snapshot(self) -> dict | None:
+        """Получить справочник целиком вместе с его версией."""
+        url = f'{self.API_URL}/menu/snapshot'
+
+        async with self.session.get(url) as response:
+            logger.log(
+                'API_REQUEST', f'Request to {url}, reponse status {response.status}'
+            )
+            self._raise_for_server_error(response)
+            if response.status == HTTPStatus.OK:
+                result = await response.json()
+                return result
+            return None
+
+    @resilient(idempotent=True)
+    async def get_bot_context(self, employee_id: int, name: str, size: int = 4) -> dict | None:
+        """Получить одним запросом сотрудника, версии настроек и справочника и первую страницу меню."""
+        url = f'{self.API_URL}/bot/context/{employee_id}?page=1&size={size}'
+        data = {'name': name}
+
+        async with self.session.post(url, json=data) as response:
+            logger.log(
+                'API_REQUEST',
+                f'Request to {url} with {data}, reponse status {response.status}',
+            )
+            self._raise_for_server_error(response)
+            if response.status == HTTPStatus.OK:
+                result = await response.json()
+                return result
+            return None
+
+    @resilient(idempotent=True)
+    async def get_bans_version(self) -> str | None:
+        """Получить версию списка заблокированных сотрудников."""
+        url = f'{self.API_URL}/messages/employees/bans/version'
+
+        async with self.session.get(url) as response:
+            logger.log(
+                'API_REQUEST', f'Request to {url}, reponse status {response.status}'
+            )
+            self._raise_for_server_error(response)
+            if response.status == HTTPStatus.OK:
+                result = await response.json()
+                return result['version']
+            return None
+
+    @resilient(idempotent=False)
     async def send_message(self, text: str, author: int) -> bool:
         """Отправить сообщение сотрудника на бэкенд."""
         url = f'{self.API_URL}/messages/'
         data = {'employee_id': author, 'text': text}
 
-        async with ClientSession() as session:
-            async with session.post(url, json=data) as response:
-                logger.log('API_REQUEST', f'Request to {url} with {data}, response status {response.status}')
-                if response.status == HTTPStatus.CREATED:
-                    return True
-                return False
+        async with self.session.post(url, json=data) as response:
+            logger.log('API_REQUEST', f'Request to {url} with {data}, response status {response.status}')
+            self._raise_for_server_error(response)
+            if response.status == HTTPStatus.CREATED:
+                return True
+            return False
 
 
 api_client = ApiClient()
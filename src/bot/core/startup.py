@@ -4,26 +4,78 @@ from aiogram import Bot, Dispatcher
 
 from config import BotSettings
 from config import settings as s
+from core.cache import employee_cache, menu_cache
+from core.log import logger
 from core.service import ApiClientException, api_client
 
+# Внеочередное обновление настроек и справочника, например при смене версий на бэкенде
+refresh_requested = asyncio.Event()
+
+
+async def refresh_settings(dispatcher: Dispatcher) -> None:
+    """Обновляем настройки, снимок справочника и кэш сотрудников в цикле."""
+    # Версия настроек, которые сейчас загружены в бот
+    settings_etag: str | None = None
+
+    while True:
+        try:
+            bot_settings, etag = await api_client.get_settings(settings_etag)
+            if bot_settings is not None:
+                dispatcher.workflow_data['settings'] = BotSettings(**bot_settings)
+                settings_etag = etag
+                dispatcher.workflow_data['settings_etag'] = etag
+        except ApiClientException:
+            pass
+        # Снимок справочника перезагружается только при смене версии на бэкенде
+        try:
+            await menu_cache.refresh()
+        except ApiClientException:
+            pass
+        # Кэш сотрудников сбрасывается при блокировке/разблокировке на бэкенде
+        try:
+            await employee_cache.refresh()
+        except ApiClientException:
+            pass
+        try:
+            await asyncio.wait_for(refresh_requested.wait(), timeout=s.SETTINGS_UPDATE_DELAY)
+        except asyncio.TimeoutError:
+            pass
+        refresh_requested.clear()
+
+
+async def log_circuit_states() -> None:
+    """Пишем состояние автоматов защиты в лог, работает и в пуллинге, и с вебхуками."""
+    while True:
+        await asyncio.sleep(s.CIRCUIT_STATE_LOG_INTERVAL)
+        states = api_client.get_circuit_states()
+        not_closed = {name: state for name, state in states.items() if state['state'] != 'closed'}
+        if not_closed:
+            logger.warning(f'⚠️  Circuits not closed: {not_closed}')
+        else:
+            logger.info(f'🟢 All {len(states)} circuits are closed')
+
 
 async def on_startup(bot: Bot, dispatcher: Dispatcher) -> None:
     """Загрузка настроек при старте бота и далее обновление по таймеру."""
+    # Общая сессия api-клиента живет всё время работы бота
+    await api_client.start()
+
+    dispatcher.workflow_data['refresh_task'] = asyncio.create_task(refresh_settings(dispatcher))
+    dispatcher.workflow_data['circuit_log_task'] = asyncio.create_task(log_circuit_states())
+
 
-    async def refresh_settings() -> None:
-        """Обновления настройки в цикле."""
-        while True:
-            try:
-                bot_settings: dict = await api_client.get_settings()
-                bs = BotSettings(**bot_settings)
-                dispatcher.workflow_data['settings'] = bs
-            except ApiClientException:
-                pass
-            await asyncio.sleep(s.SETTINGS_UPDATE_DELAY)
+async def on_shutdown(dispatcher: Dispatcher) -> None:
+    """Останавливаем фоновые задачи и закрываем соединения с бэкендом."""
+    for task_name in ('refresh_task', 'circuit_log_task'):
+        task: asyncio.Task | None = dispatcher.workflow_data.pop(task_name, None)
+        if task is not None:
+            task.cancel()
 
-    asyncio.create_task(refresh_settings())
+    await api_client.close()
+    await dispatcher.storage.close()
 
 
 def register_startup(dp: Dispatcher) -> None:
-    """Регистрируем функцию для запуска на старте работы бота."""
+    """Регистрируем функции для запуска на старте и при остановке бота."""
     dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
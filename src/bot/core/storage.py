@@ -0,0 +1,104 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from config import settings as s
+from core.log import logger
+
+
+class SQLiteStorage(BaseStorage):
+    """Локальное хранилище состояний в файле SQLite, замена Redis для тестов и одного процесса."""
+
+    def __init__(self, path: str, state_ttl: int | None = None, data_ttl: int | None = None) -> None:
+        self.key_builder = DefaultKeyBuilder(with_destiny=True)
+        self.state_ttl = state_ttl
+        self.data_ttl = data_ttl
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS fsm_storage ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+        )
+        self._connection.commit()
+
+    def _read(self, key: str) -> Any:
+        """Читаем значение ключа, просроченные ключи удаляем."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value, expires_at FROM fsm_storage WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._connection.execute('DELETE FROM fsm_storage WHERE key = ?', (key,))
+                self._connection.commit()
+                return None
+        return json.loads(value)
+
+    def _write(self, key: str, value: Any, ttl: int | None) -> None:
+        """Записываем значение ключа, пустое значение удаляет ключ."""
+        with self._lock:
+            if value is None:
+                self._connection.execute('DELETE FROM fsm_storage WHERE key = ?', (key,))
+            else:
+                expires_at = time.time() + ttl if ttl else None
+                self._connection.execute(
+                    'INSERT INTO fsm_storage (key, value, expires_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at',
+                    (key, json.dumps(value), expires_at),
+                )
+            self._connection.commit()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """Устанавливаем состояние."""
+        value = state.state if isinstance(state, State) else state
+        await asyncio.to_thread(self._write, self.key_builder.build(key, 'state'), value, self.state_ttl)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        """Получаем состояние."""
+        return await asyncio.to_thread(self._read, self.key_builder.build(key, 'state'))
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        """Записываем данные состояния."""
+        await asyncio.to_thread(
+            self._write, self.key_builder.build(key, 'data'), dict(data) or None, self.data_ttl
+        )
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        """Получаем данные состояния."""
+        data = await asyncio.to_thread(self._read, self.key_builder.build(key, 'data'))
+        return data or {}
+
+    async def close(self) -> None:
+        """Закрываем соединение с файлом хранилища."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def build_storage() -> BaseStorage:
+    """Создаем хранилище состояний согласно настройкам."""
+    if s.FSM_STORAGE == 'redis':
+        # Импорт здесь, чтобы пакет redis был нужен только при работе с Redis
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        logger.info('🗄️  FSM storage: Redis')
+        return RedisStorage.from_url(
+            s.REDIS_URL, state_ttl=s.FSM_STATE_TTL, data_ttl=s.FSM_STATE_TTL
+        )
+
+    if s.FSM_STORAGE == 'sqlite':
+        logger.info(f'🗄️  FSM storage: SQLite ({s.FSM_SQLITE_PATH})')
+        return SQLiteStorage(s.FSM_SQLITE_PATH, state_ttl=s.FSM_STATE_TTL, data_ttl=s.FSM_STATE_TTL)
+
+    logger.info('🗄️  FSM storage: memory (single replica only)')
+    return MemoryStorage()
@@ -1,41 +1,110 @@
 import asyncio
+import signal
+from typing import Any
 
 from aiogram import Bot, Dispatcher
-from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiogram.methods import TelegramMethod
+from aiogram.webhook.aiohttp_server import setup_application
 from aiohttp import web
 
 from config import settings as s
 from core.log import logger
 
+SECRET_TOKEN_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+class UpdateProcessor:
+    """Прием апдейтов вебхука с немедленным ответом и фоновой обработкой."""
+
+    def __init__(self, bot: Bot, dispatcher: Dispatcher) -> None:
+        self.bot = bot
+        self.dispatcher = dispatcher
+        self._semaphore = asyncio.Semaphore(s.WEBHOOK_MAX_CONCURRENT_UPDATES)
+        self._tasks: set[asyncio.Task] = set()
+        self._accepting = True
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Принимаем апдейт от Telegram и сразу отвечаем, обработка идет в фоне."""
+        if request.headers.get(SECRET_TOKEN_HEADER) != s.WEBHOOK_SECRET:
+            return web.Response(status=401)
+
+        # Telegram повторит доставку апдейта позже, если сейчас его некуда принять
+        if not self._accepting or len(self._tasks) >= s.WEBHOOK_MAX_PENDING_UPDATES:
+            return web.Response(status=503)
+
+        update: dict[str, Any] = await request.json()
+        task = asyncio.create_task(self._process(update))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return web.json_response({})
+
+    async def _process(self, update: dict[str, Any]) -> None:
+        """Обрабатываем апдейт, соблюдая ограничение на число одновременных обработок."""
+        async with self._semaphore:
+            try:
+                result = await self.dispatcher.feed_raw_update(self.bot, update)
+                # Хэндлер может вернуть метод API вместо явного вызова
+                if isinstance(result, TelegramMethod):
+                    await self.dispatcher.silent_call_request(self.bot, result)
+            except Exception as e:
+                logger.error(f'❌ Error while processing update {update.get("update_id")}: {e!r}')
+
+    async def drain(self, app: web.Application) -> None:
+        """Перестаем принимать апдейты и дожидаемся обработки уже принятых."""
+        self._accepting = False
+        if not self._tasks:
+            return
+
+        logger.info(f'⏳ Waiting for {len(self._tasks)} updates to be processed')
+        _, pending = await asyncio.wait(self._tasks, timeout=s.WEBHOOK_SHUTDOWN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f'⚠️  {len(pending)} updates were cancelled on shutdown')
+
 
 async def setup_webhook(bot: Bot, dispatcher: Dispatcher) -> None:
-    """Настраивает вебхуки и запускаем aiohttp-сервер. Используется только в проде."""
+    """Настраивает вебхуки и запускает aiohttp-сервер до получения сигнала остановки."""
     webhook_url = f'{s.BASE_WEBHOOK_URL}{s.WEBHOOK_PATH}'
-    logger.info(f'🌍 Setting webhook to {webhook_url}')
-
-    await bot.set_webhook(
-        url=webhook_url,
-        secret_token=s.WEBHOOK_SECRET,
-        drop_pending_updates=True,
-    )
 
     # Создаем приложение Aiohttp
     app = web.Application()
     app['bot'] = bot
 
-    # Регистрируем хэндлер вебхуков и настраиваем диспетчер
-    SimpleRequestHandler(dispatcher=dispatcher, bot=bot).register(
-        app, path=s.WEBHOOK_PATH
-    )
+    # Регистрируем хэндлер вебхуков
+    processor = UpdateProcessor(bot, dispatcher)
+    app.router.add_post(s.WEBHOOK_PATH, processor.handle)
+
+    # Сначала дожидаемся принятых апдейтов, и только потом останавливаем диспетчер
+    app.on_shutdown.append(processor.drain)
     setup_application(app, dispatcher, bot=bot)
 
-    # Запускаем сервер
+    # Запускаем сервер, на старте срабатывают startup-хэндлеры диспетчера
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, host=s.WEB_SERVER_HOST, port=s.WEB_SERVER_PORT)
     await site.start()
-
     logger.info(f'🚀 Webhook server started on {s.WEB_SERVER_HOST}:{s.WEB_SERVER_PORT}')
+
+    # Вебхук ставим, когда сервер уже готов принимать апдейты
+    logger.info(f'🌍 Setting webhook to {webhook_url}')
+    await bot.set_webhook(
+        url=webhook_url,
+        secret_token=s.WEBHOOK_SECRET,
+        allowed_updates=s.ALLOWED_UPDATES,
+        max_connections=s.WEBHOOK_MAX_CONNECTIONS,
+    )
     logger.info(f'✅ Listening for updates at {webhook_url}')
 
-    await asyncio.Event().wait()
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info('🛑 Stopping webhook server')
+        await runner.cleanup()
+        await bot.session.close()
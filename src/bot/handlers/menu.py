@@ -4,25 +4,33 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 from aiogram.types.callback_query import CallbackQuery
 
 from config import BotCallback, BotDir, BotSettings
+from core.cache import menu_cache
 from core.service import ApiClientException, api_client
 
 menu_router = Router(name=__name__)
 
 
 async def _menu_inline_keyboard_builder(
-    message: Message, bs: BotSettings, page: int = 1
+    message: Message, bs: BotSettings, page: int = 1, menu_page: dict | None = None
 ) -> list:
     """Собираем элементы экранной клавиатуры."""
     if page is None:
         page = 1
 
-    try:
-        menu_page: dict = await api_client.get_menu_page(
-            page=page, size=bs.MENU_BUTTONS_PER_PAGE
-        )
-    except ApiClientException:
-        await message.answer(bs.ERROR_CONNECTION_TO_BACKEND_API)
-        return None
+    # В штатном режиме страница собирается из снимка справочника без обращения к бэкенду
+    if menu_cache.is_loaded:
+        menu_page: dict = menu_cache.get_page(page, bs.MENU_BUTTONS_PER_PAGE)
+    elif menu_page is not None and page == 1:
+        # Первая страница уже пришла вместе с контекстом бота
+        pass
+    else:
+        try:
+            menu_page: dict = await api_client.get_menu_page(
+                page=page, size=bs.MENU_BUTTONS_PER_PAGE
+            )
+        except ApiClientException:
+            await message.answer(bs.ERROR_CONNECTION_TO_BACKEND_API)
+            return None
 
     inline_keyboard = []
 
@@ -70,10 +78,10 @@ async def _menu_inline_keyboard_builder(
 
 @menu_router.message(Command('menu'))
 async def command_menu_handler(
-    message: Message, bs: BotSettings, page: int = 1
+    message: Message, bs: BotSettings, page: int = 1, menu_page: dict | None = None
 ) -> None:
     """Обработчик команды /menu."""
-    inline_keyboard = await _menu_inline_keyboard_builder(message, bs, page)
+    inline_keyboard = await _menu_inline_keyboard_builder(message, bs, page, menu_page)
     if inline_keyboard:
         await message.answer(
             text=bs.INVITATION_TO_EXPLORE_THE_MENU,
@@ -85,6 +93,12 @@ async def _print_menu_item(
     message: Message, menu_item_id: int, bs: BotSettings
 ) -> None:
     """Выдаем ответ на выбранный пользователем элемент справочника."""
+    if menu_cache.is_loaded:
+        item: dict | None = menu_cache.get_item(menu_item_id)
+        if item:
+            await message.answer(item['answer'])
+        return
+
     try:
         item: dict = await api_client.get_menu_item(menu_item_id)
         if item:
@@ -23,13 +23,13 @@ async def main() -> None:
     # Регистрируем функцию для запуска на старте бота
     register_startup(dispatcher)
 
-    if 1 == 0 and s.PROD_ENVIRONMENT:
-        # В проде работаем через вебхуки (в теории)
-        logger.info('⚙️  Running in PRODUCTION mode (Webhook enabled)')
+    if s.USE_WEBHOOK:
+        # В проде работаем через вебхуки
+        logger.info('⚙️  Running in WEBHOOK mode')
         await setup_webhook(bot, dispatcher)
     else:
         # В деве/тесте работаем с пуллингом
-        logger.info('⚙️  Running in DEVELOPMENT mode (Polling enabled)')
+        logger.info('⚙️  Running in POLLING mode')
         await bot.delete_webhook(drop_pending_updates=True)
         await dispatcher.start_polling(
             bot,
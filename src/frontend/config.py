@@ -17,7 +17,16 @@ class Settings(BaseSettings):
     API_HOST: str = os.getenv('HRBOT_API_HOST', '127.0.0.1')
     API_PORT: str = os.getenv('HRBOT_API_PORT', '8000')
     SECRET_KEY: str = os.getenv('HRBOT_NICEGUI_SECRET_KEY', 'default_secret_key')
+    # Сессии админки: 'db' - проверка на бэкенде, 'token' - проверка подписи токена на месте
+    AUTH_SESSION_MODE: str = os.getenv('HRBOT_AUTH_SESSION_MODE', 'db')
+    AUTH_TOKEN_SECRET: str = os.getenv('HRBOT_AUTH_TOKEN_SECRET', '')
+    AUTH_REVOCATION_SYNC_INTERVAL: int = 30
     USERS_PER_PAGE: int = 3
+    # Общий пул соединений с бэкендом
+    API_MAX_CONNECTIONS: int = os.getenv('HRBOT_API_MAX_CONNECTIONS', 100)
+    API_KEEPALIVE_TIMEOUT: int = 30
+    API_CONNECT_TIMEOUT: int = 5
+    API_TIMEOUT: int = os.getenv('HRBOT_API_TIMEOUT', 30)
 
     DATETIME_FORMAT: str = '%d.%m.%Y %H:%M:%S'
 
@@ -1,10 +1,18 @@
 from nicegui import app as nicegui_app
-from nicegui import ui
+from nicegui import background_tasks, ui
 
 from config import settings
+from pages.auth.constants import AUTH_SESSION_MODE_TOKEN
+from pages.auth.tokens import sync_revocations_task
+from pages.base_service import close_http_session, start_http_session
 from routers import main_router
 
 nicegui_app.include_router(main_router)
+# Общая сессия с пулом соединений к бэкенду живет вместе с приложением
+nicegui_app.on_startup(start_http_session)
+nicegui_app.on_shutdown(close_http_session)
+if settings.AUTH_SESSION_MODE == AUTH_SESSION_MODE_TOKEN:
+    nicegui_app.on_startup(lambda: background_tasks.create(sync_revocations_task(), name='sync_revocations'))
 
 ui.run(
     title=settings.APP_TITLE,
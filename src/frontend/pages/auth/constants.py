@@ -0,0 +1,2 @@
+AUTH_SESSION_MODE_DB = 'db'
+AUTH_SESSION_MODE_TOKEN = 'token'
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+
+from pages.users.schemas import RoleReadSchema
+
+
+class SessionTokenSchema(BaseModel):
+    """Модель содержимого подписанного токена сессии."""
+
+    sid: str
+    user_id: int
+    username: str
+    role: RoleReadSchema
+    iat: float
+    exp: int
+
+
+class SessionUserSchema(BaseModel):
+    """Модель текущего пользователя, восстановленного из токена сессии."""
+
+    id: int
+    username: str
+    is_active: bool = True
+    role: RoleReadSchema
+
+
+class RevocationListSchema(BaseModel):
+    """Модель списка отозванных токенов сессий."""
+
+    sessions: list[str]
+    users: dict[int, float]
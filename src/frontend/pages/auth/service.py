@@ -1,8 +1,9 @@
-from aiohttp import ClientResponse, ClientSession
+from aiohttp import ClientResponse
 from fastapi import status
 
 from config import settings
-from pages.base_service import BaseApiClient
+from pages.auth.schemas import RevocationListSchema
+from pages.base_service import BaseApiClient, get_http_session
 from pages.users.schemas import UserReadSchema
 
 
@@ -28,9 +29,9 @@ class AuthApiClient(BaseApiClient):
     async def user_login(self, data_input: dict) -> dict:
         """Аутентификация по логину и паролю."""
         url = f'{settings.API_URL}/{self.MODULE_URL}/'
-        async with ClientSession() as session:
-            async with session.post(url, json=data_input) as response:
-                return await self._login_response_parser(response)
+        session = await get_http_session()
+        async with session.post(url, json=data_input) as response:
+            return await self._login_response_parser(response)
 
     async def get_user_by_session(self, session_id: int) -> UserReadSchema | None:
         """Получить пользователя по номеру сессии."""
@@ -38,6 +39,12 @@ class AuthApiClient(BaseApiClient):
         user = await self.get(url)
         return UserReadSchema(**user) if user else None
 
+    async def get_revocation_list(self) -> RevocationListSchema | None:
+        """Получить список отозванных токенов сессий."""
+        url = f'{settings.API_URL}/{self.MODULE_URL}/revoked'
+        revocations = await self.get(url)
+        return RevocationListSchema.model_validate(revocations) if revocations else None
+
     async def delete_session(self, session_id: int) -> None:
         """Удалить сессию на бэкенде."""
         url = f'{settings.API_URL}/{self.MODULE_URL}/{session_id}'
@@ -0,0 +1,85 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+from pydantic import ValidationError
+
+from config import settings
+from log import logger
+from pages.auth.schemas import RevocationListSchema, SessionTokenSchema
+from pages.auth.service import auth_api_client
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def verify_session_token(token: str) -> SessionTokenSchema | None:
+    """Проверяем подпись и срок действия токена, выпущенного бэкендом."""
+    payload, _, signature = token.partition('.')
+    digest = hmac.new(settings.AUTH_TOKEN_SECRET.encode(), payload.encode('ascii'), hashlib.sha256).digest()
+    if not settings.AUTH_TOKEN_SECRET or not payload or not hmac.compare_digest(signature, _b64encode(digest)):
+        return None
+
+    try:
+        token_schema = SessionTokenSchema.model_validate(json.loads(_b64decode(payload)))
+    except (ValueError, ValidationError):
+        return None
+
+    return token_schema if token_schema.exp > time.time() else None
+
+
+class RevocationList:
+    """Отозванные токены сессий, копия списка бэкенда."""
+
+    def __init__(self) -> None:
+        self._sessions: set[str] = set()
+        self._users: dict[int, float] = {}
+        # Отозванные здесь токены, которых еще может не быть в списке бэкенда
+        self._pending: dict[str, float] = {}
+
+    def is_revoked(self, token: SessionTokenSchema) -> bool:
+        """Проверяем, отозван ли токен сам по себе или вместе со всеми токенами пользователя."""
+        if token.sid in self._sessions:
+            return True
+        revoked_at = self._users.get(token.user_id)
+        return revoked_at is not None and token.iat <= revoked_at
+
+    def revoke_session(self, sid: str) -> None:
+        """Отзываем токен сразу после выхода, не дожидаясь синхронизации."""
+        self._sessions.add(sid)
+        self._pending[sid] = time.monotonic()
+
+    def update(self, revocations: RevocationListSchema) -> None:
+        """Заменяем список полученным от бэкенда, сохраняя свежие локальные отзывы."""
+        sessions = set(revocations.sessions)
+        # За два цикла синхронизации отзыв гарантированно доходит до всех процессов бэкенда
+        expired_before = time.monotonic() - 2 * settings.AUTH_REVOCATION_SYNC_INTERVAL
+        self._pending = {
+            sid: revoked_at for sid, revoked_at in self._pending.items()
+            if sid not in sessions and revoked_at > expired_before
+        }
+        self._sessions = sessions | set(self._pending)
+        self._users = revocations.users
+
+
+revocation_list = RevocationList()
+
+
+async def sync_revocations_task() -> None:
+    """Периодически получаем список отзывов от бэкенда."""
+    while True:
+        try:
+            revocations = await auth_api_client.get_revocation_list()
+            if revocations is not None:
+                revocation_list.update(revocations)
+        except Exception as e:
+            logger.log('AUTH', f'Revocation list sync failed: {e!r}')
+        await asyncio.sleep(settings.AUTH_REVOCATION_SYNC_INTERVAL)
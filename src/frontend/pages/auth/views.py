@@ -5,6 +5,7 @@ from nicegui import APIRouter, ui
 
 from log import logger
 from pages.auth.service import auth_api_client
+from pages.auth.tokens import revocation_list, verify_session_token
 from pages.dependencies import get_current_user
 from pages.layout import navbar
 import pages.styles as st
@@ -87,6 +88,9 @@ async def user_logout(request: Request) -> None:
         'document.cookie = "session_id=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT";'
     )
     session_id = request.cookies.get('session_id')
+    token = verify_session_token(session_id) if session_id else None
+    if token is not None:
+        revocation_list.revoke_session(token.sid)
     await auth_api_client.delete_session(session_id)
     logger.log('AUTH', f'Session {session_id} was removed')
     ui.navigate.to(LOGIN_PAGE_URL)
@@ -1,9 +1,43 @@
-from aiohttp import ClientResponse, ClientSession
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, CookieJar, TCPConnector
 from fastapi import status
 
+from config import settings
 from log import logger
 from pages.utils import url_shortener
 
+# Одна сессия на приложение: соединения с бэкендом переиспользуются между запросами
+_http_session: ClientSession | None = None
+
+
+async def start_http_session() -> None:
+    """Создаем общую сессию с пулом соединений, вызывается при запуске приложения."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = ClientSession(
+            connector=TCPConnector(
+                limit=settings.API_MAX_CONNECTIONS,
+                keepalive_timeout=settings.API_KEEPALIVE_TIMEOUT,
+            ),
+            timeout=ClientTimeout(total=settings.API_TIMEOUT, connect=settings.API_CONNECT_TIMEOUT),
+            # Бэкенд отмечает куками недавние записи, чтобы следующие чтения шли в основную БД;
+            # unsafe - чтобы куки принимались и от бэкенда, адресованного по IP
+            cookie_jar=CookieJar(unsafe=True),
+        )
+
+
+async def close_http_session() -> None:
+    """Закрываем общую сессию при остановке приложения."""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+async def get_http_session() -> ClientSession:
+    """Получаем общую сессию, при необходимости создаем ее."""
+    await start_http_session()
+    return _http_session
+
 
 class BaseApiClient:
     """Базовый класс методов api-клиента."""
@@ -31,48 +65,48 @@ class BaseApiClient:
 
     async def get(self, url: str) -> dict | list[dict] | None:
         """Получить данные от бэкенда."""
-        async with ClientSession() as session:
-            async with session.get(url) as response:
-                logger.log(
-                    'API_REQUEST',
-                    f'Method: GET, URL: {url_shortener(url)}, status: {response.status}',
-                )
+        session = await get_http_session()
+        async with session.get(url) as response:
+            logger.log(
+                'API_REQUEST',
+                f'Method: GET, URL: {url_shortener(url)}, status: {response.status}',
+            )
 
-                if response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR:
-                    return {'OK': False, 'message': 'Ошибка получения данных'}
+            if response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                return {'OK': False, 'message': 'Ошибка получения данных'}
 
-                if response.status == status.HTTP_200_OK:
-                    result = await response.json()
-                    return result
+            if response.status == status.HTTP_200_OK:
+                result = await response.json()
+                return result
 
-                return None
+            return None
 
     async def post(self, url: str, data_input: dict) -> dict:
         """Создать запись на бэкенде."""
-        async with ClientSession() as session:
-            async with session.post(url, json=data_input) as response:
-                logger.log(
-                    'API_REQUEST',
-                    f'Method: POST, URL: {url_shortener(url)}, status: {response.status}',
-                )
-                return await self._response_parser(response)
+        session = await get_http_session()
+        async with session.post(url, json=data_input) as response:
+            logger.log(
+                'API_REQUEST',
+                f'Method: POST, URL: {url_shortener(url)}, status: {response.status}',
+            )
+            return await self._response_parser(response)
 
     async def patch(self, url: str, data_input: dict) -> dict:
         """Обновить данные записи на бэкенде."""
-        async with ClientSession() as session:
-            async with session.patch(url, json=data_input) as response:
-                logger.log(
-                    'API_REQUEST',
-                    f'Method: PATCH, URL: {url_shortener(url)}, status: {response.status}',
-                )
-                return await self._response_parser(response)
+        session = await get_http_session()
+        async with session.patch(url, json=data_input) as response:
+            logger.log(
+                'API_REQUEST',
+                f'Method: PATCH, URL: {url_shortener(url)}, status: {response.status}',
+            )
+            return await self._response_parser(response)
 
     async def delete(self, url: str) -> None:
         """Удалить данне на бэкенде бэкенда."""
-        async with ClientSession() as session:
-            async with session.delete(url) as response:
-                logger.log(
-                    'API_REQUEST',
-                    f'Method: DELETE, URL: {url_shortener(url)}, status: {response.status}',
-                )
-                return
+        session = await get_http_session()
+        async with session.delete(url) as response:
+            logger.log(
+                'API_REQUEST',
+                f'Method: DELETE, URL: {url_shortener(url)}, status: {response.status}',
+            )
+            return
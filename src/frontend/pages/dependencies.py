@@ -1,13 +1,27 @@
 from fastapi import Depends, Request
 
+from config import settings
+from pages.auth.constants import AUTH_SESSION_MODE_TOKEN
+from pages.auth.schemas import SessionUserSchema
 from pages.auth.service import auth_api_client
+from pages.auth.tokens import revocation_list, verify_session_token
 from pages.users.schemas import UserReadSchema
 
 
-async def get_current_user(request: Request) -> UserReadSchema | None:
+async def get_current_user(request: Request) -> UserReadSchema | SessionUserSchema | None:
     """Получить текущего пользователя."""
     session_id = request.cookies.get('session_id')
-    return await auth_api_client.get_user_by_session(session_id) if session_id else None
+    if not session_id:
+        return None
+
+    # Подписанный токен проверяем на месте, без запроса к бэкенду
+    if settings.AUTH_SESSION_MODE == AUTH_SESSION_MODE_TOKEN:
+        token = verify_session_token(session_id)
+        if token is None or revocation_list.is_revoked(token):
+            return None
+        return SessionUserSchema(id=token.user_id, username=token.username, role=token.role)
+
+    return await auth_api_client.get_user_by_session(session_id)
 
 
 async def get_edit_users_permission(
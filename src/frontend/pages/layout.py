@@ -24,3 +24,17 @@ def navbar(user: UserReadSchema | None = None) -> None:
                 ui.link('Выйти', LOGOUT_PAGE_URL).classes(st.NAVBAR_ELEMENT)
             else:
                 ui.link('Войти', LOGIN_PAGE_URL).classes(st.NAVBAR_ELEMENT)
+
+
+async def confirm(text: str) -> bool:
+    """Диалог подтверждения действия, возвращаем выбор пользователя."""
+    with ui.dialog() as dialog, ui.card().classes(st.CARD):
+        ui.label(text).classes(st.LABEL)
+        with ui.row().classes(st.ROW):
+            ui.button('ДА', on_click=lambda: dialog.submit(True)).props(st.BUTTON_PROPS).classes(st.BUTTON)
+            ui.button('НЕТ', on_click=lambda: dialog.submit(False)).props(st.BUTTON_PROPS).classes(st.BUTTON)
+
+    # Закрытие диалога без выбора возвращает None
+    result = await dialog
+    dialog.delete()
+    return bool(result)
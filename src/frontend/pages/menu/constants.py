@@ -7,3 +7,6 @@ ERROR_MESSAGE_NO_PERMISSION = (
     'Операция невозможна. Пользователь отсутствует или не имеет полномочий.'
 )
 ERROR_MESSAGE_ENTRY_DOESNT_EXIST = 'Запрошенная запись не существует'
+CONFIRM_RESTORE_MENU = (
+    'Восстановить справочник из последней копии? Текущие данные тоже будут сохранены в копию.'
+)
@@ -47,5 +47,10 @@ class MenuApiClient(BaseApiClient):
         url = f'{settings.API_URL}/{self.MODULE_URL}/upload'
         return await self.post(url, data_input)
 
+    async def restore_menu(self) -> dict:
+        """Восстановить справочник из копии, снятой перед последней загрузкой."""
+        url = f'{settings.API_URL}/{self.MODULE_URL}/restore'
+        return await self.post(url, {})
+
 
 menu_api_client = MenuApiClient()
@@ -8,8 +8,9 @@ from nicegui import APIRouter, ui
 
 from config import settings as s
 from pages.dependencies import get_current_user, get_edit_menu_permission
-from pages.layout import navbar
+from pages.layout import confirm, navbar
 from pages.menu.constants import (
+    CONFIRM_RESTORE_MENU,
     MENU_ANSWER_MAX_LENGTH,
     MENU_BUTTON_TEXT_MAX_LENGTH,
     MENU_PAGE_SIZE,
@@ -129,6 +130,12 @@ async def _download_upload_menu_button_handler(func: Callable, *args) -> None:
         ui.notify(result['message'], type='negative')
 
 
+async def _restore_menu_button_handler() -> None:
+    """Обрабатываем нажатие кнопки Отменить загрузку после подтверждения."""
+    if await confirm(CONFIRM_RESTORE_MENU):
+        await _download_upload_menu_button_handler(menu_api_client.restore_menu)
+
+
 @menu_router.page('/', title='Справочник элементов меню')
 async def menu_page(
     page: int = 1,
@@ -165,6 +172,10 @@ async def menu_page(
                     'ЗАГРУЗИТЬ ИЗ ФАЙЛА',
                     on_click=lambda x=menu_api_client.upload_menu: _download_upload_menu_button_handler(x, {'created_by_id': current_user.id})
                     ).props(st.BUTTON_PROPS).classes(st.BUTTON)
+                ui.button(
+                    'ОТМЕНИТЬ ЗАГРУЗКУ',
+                    on_click=_restore_menu_button_handler
+                    ).props(st.BUTTON_PROPS).classes(st.BUTTON)
 
     # Выводим список элементов меню
     for menu_item in menu_page.items:
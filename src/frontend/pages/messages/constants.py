@@ -1,3 +1,8 @@
 MESSAGE_TEXT_MAX_LENGTH = 2048
+CHAT_PAGE_SIZE = 100
+CHAT_POLL_INTERVAL_IN_SECONDS = 3
+CHATS_PAGE_SIZE = 50
 
 ERROR_MESSAGE_TOO_LONG = 'Недопустимая длина сообщения'
+ERROR_MESSAGE_LOAD_FAILED = 'Не удалось загрузить сообщения'
+ERROR_MESSAGE_CHATS_LOAD_FAILED = 'Не удалось загрузить список чатов'
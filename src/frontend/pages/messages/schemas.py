@@ -35,6 +35,14 @@ class EmployeeChatListSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EmployeeChatListPageSchema(BaseModel):
+    """Модель страницы со списком чатов."""
+    items: list[EmployeeChatListSchema]
+    total: int
+    page: int
+    pages: int
+
+
 class EmployeeReadSchema(BaseModel, CustomDateFormat):
     """Модель представления сотрудника."""
     id: int
@@ -63,14 +71,13 @@ class MessageReadSchema(BaseModel, CustomDateFormat):
     )
 
 
-class Page(BaseModel):
-    """Вручную собранная модель fastapi-pagination."""
+class CursorPage(BaseModel):
+    """Модель страницы сообщений с курсорами."""
 
     items: list[MessageReadSchema]
-    total: int
-    page: int
     size: int
-    pages: int
+    prev_cursor: int | None
+    next_cursor: int | None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -79,4 +86,4 @@ class Page(BaseModel):
 
 class EmployeeChatSchema(EmployeeReadSchema):
     """Модель чата со страницей с сообщениями."""
-    messages: Page
+    messages: CursorPage
@@ -1,27 +1,59 @@
+from urllib.parse import urlencode
+
 from config import settings
 from pages.base_service import BaseApiClient
+from pages.messages.constants import CHAT_PAGE_SIZE, CHATS_PAGE_SIZE
 from pages.messages.schemas import (
-    EmployeeChatListSchema,
+    EmployeeChatListPageSchema,
     EmployeeChatSchema,
 )
+from pydantic import ValidationError
 
 
 class MessagesApiClient(BaseApiClient):
     """Класс методов api-клиента."""
     MODULE_URL = 'messages'
 
-    async def get_chats(self) -> list[EmployeeChatListSchema]:
-        """Получить список чатов от бэкенда."""
-        url = f'{settings.API_URL}/{self.MODULE_URL}/employees'
-        chats = await self.get(url)
-        chats = [EmployeeChatListSchema.model_validate(c) for c in chats]
-        return chats
+    async def get_chats(
+        self,
+        page: int = 1,
+        unread: bool | None = None,
+        is_banned: bool | None = None,
+        name: str | None = None,
+    ) -> EmployeeChatListPageSchema | None:
+        """Получить страницу списка чатов от бэкенда."""
+        params = {
+            'page': page,
+            'size': CHATS_PAGE_SIZE,
+        }
+        if unread is not None:
+            params['unread'] = unread
+        if is_banned is not None:
+            params['is_banned'] = is_banned
+        if name:
+            params['name'] = name
+
+        query_string = urlencode(params)
+        url = f'{settings.API_URL}/{self.MODULE_URL}/employees/?{query_string}'
+        response = await self.get(url)
+        # При ошибке бэкенд-клиент возвращает None или словарь с описанием ошибки
+        try:
+            return EmployeeChatListPageSchema.model_validate(response)
+        except ValidationError:
+            return None
 
-    async def get_chat(self, chat_id: int) -> EmployeeChatSchema:
-        """Получить чат от бэкенда."""
+    async def get_chat(
+        self, chat_id: int, before: int | None = None, after: int | None = None
+    ) -> EmployeeChatSchema:
+        """Получить от бэкенда последние сообщения чата либо сообщения до/после указанного."""
         url = (
-            f'{settings.API_URL}/{self.MODULE_URL}/employees/{chat_id}/chat?page=1&size=100'
+            f'{settings.API_URL}/{self.MODULE_URL}/employees/{chat_id}/chat/cursor'
+            f'?size={CHAT_PAGE_SIZE}'
         )
+        if before is not None:
+            url += f'&before={before}'
+        if after is not None:
+            url += f'&after={after}'
         chat = await self.get(url)
         chat = EmployeeChatSchema.model_validate(chat)
         return chat
@@ -1,59 +1,265 @@
 import asyncio
-from functools import partial
+from typing import Callable
 
+from aiohttp import ClientError
 from fastapi import Depends
 from nicegui import APIRouter, ui
 
+from config import settings as s
+
 from pages.dependencies import get_current_user, get_send_messages_permission
 from pages.layout import navbar
 from pages.messages.constants import (
+    CHAT_POLL_INTERVAL_IN_SECONDS,
+    ERROR_MESSAGE_CHATS_LOAD_FAILED,
+    ERROR_MESSAGE_LOAD_FAILED,
     ERROR_MESSAGE_TOO_LONG,
     MESSAGE_TEXT_MAX_LENGTH,
 )
 from pages.messages.schemas import (
-    EmployeeChatListSchema,
+    EmployeeChatListPageSchema,
     EmployeeChatSchema,
+    MessageReadSchema,
 )
 from pages.messages.service import messages_api_client
 import pages.styles as st
 from pages.urls import LOGIN_PAGE_URL, MESSAGES_PAGE_URL
 from pages.users.schemas import UserReadSchema
+from pages.utils import build_url
+from pydantic import ValidationError
 
 messages_router = APIRouter()
 
 
-async def _ban_unban_employee_button_handler(
-    employee_id: int, is_banned: bool, updated_by_id: int
-) -> None:
-    """Обрабатываем нажатие кнопки Отправить сообщение."""
-    data_input = {'is_banned': not is_banned, 'updated_by_id': updated_by_id}
-    result = await messages_api_client.ban_unban_employee(employee_id, data_input)
+def _render_message(message: MessageReadSchema, employee_name: str | None) -> None:
+    """Выводим одно сообщение чата."""
+    with ui.row().classes('w-full mb-2'):
+        with ui.row().classes(st.ALIGN_RIGTH if bool(message.manager) else st.ALIGN_LEFT):
+            message_element = ui.chat_message(
+                text=message.text,
+                name=employee_name if message.manager is None else message.manager.username,
+                sent=bool(message.manager),
+                stamp=message.created_at_str,
+            ).classes('inline-block max-w-[70%]')
+            # Выделяем непрочитанные сообщения
+            if not message.is_read:
+                message_element.classes(st.LABEL_BOLD)
 
-    if result['OK']:
-        ui.notify(result['message'], type='positive')
-        await asyncio.sleep(1)
-        ui.navigate.to(MESSAGES_PAGE_URL)
-    else:
-        ui.notify(result['message'], type='negative')
 
+class ChatView:
+    """Чат с сотрудником: новые сообщения дописываются на страницу без ее перезагрузки."""
 
-async def _send_message_button_handler(
-    employee_id: int, text: str, manager_id: int
-) -> None:
-    """Обрабатываем нажатие кнопки Отправить сообщение."""
-    data_input = {'employee_id': employee_id, 'text': text, 'manager_id': manager_id}
-    result = await messages_api_client.send_message(data_input)
+    def __init__(self, chat: EmployeeChatSchema, manager_id: int | None, permission: bool) -> None:
+        self.chat = chat
+        self.manager_id = manager_id
+        self.permission = permission
+        # Последнее выведенное сообщение, с него запрашиваем новые
+        self.next_cursor = chat.messages.next_cursor
+        # Самое раннее выведенное сообщение, если до него есть еще
+        self.prev_cursor = chat.messages.prev_cursor
+        # Отметку о прочтении не удалось отправить - повторим при следующем опросе
+        self.unread_pending = False
+        self.messages_card: ui.card | None = None
+        self.older_button: ui.button | None = None
+        self.older_messages: ui.column | None = None
+        self.new_message_input: ui.input | None = None
+        self._lock = asyncio.Lock()
+
+    @ui.refreshable
+    def header(self) -> None:
+        """Заголовки страницы."""
+        ui.item_label(f'Чат с сотрудником {self.chat.name}').classes(st.PAGE_HEADER)
+        if self.chat.is_banned:
+            ui.item_label('БАН').classes(st.LABEL_RED)
+
+    def messages(self) -> None:
+        """Сообщения чата, загруженные при открытии страницы."""
+        with ui.card().classes(st.THIRD_WIDTH) as self.messages_card:
+            self.older_button = ui.button(
+                'ПОКАЗАТЬ РАНЕЕ', on_click=self.load_older_messages
+            ).props(st.BUTTON_PROPS).classes(st.BUTTON)
+            self.older_button.visible = self.prev_cursor is not None
+            # Более ранние сообщения добавляются в начало этого блока
+            self.older_messages = ui.column().classes(st.FULL_WIDTH)
+            for message in self.chat.messages.items:
+                _render_message(message, self.chat.name)
+
+    @ui.refreshable
+    def controls(self) -> None:
+        """Поле для ввода ответа и кнопки."""
+        with ui.row():
+            if self.permission:
+                self.new_message_input = ui.input(
+                    placeholder='Введите ответ',
+                    validation={
+                        ERROR_MESSAGE_TOO_LONG: lambda value: 0
+                        < len(value)
+                        < MESSAGE_TEXT_MAX_LENGTH
+                    },
+                ).props(st.INPUT_PROPS).classes(st.INPUT)
+                ui.button(
+                    'ОТПРАВИТЬ', on_click=self.send_message
+                ).props(st.BUTTON_PROPS).classes(st.BUTTON)
+                ban_button_title = 'РАЗБАНИТЬ СОТРУДНИКА' if self.chat.is_banned else 'ЗАБАНИТЬ СОТРУДНИКА'
+                ui.button(
+                    ban_button_title, on_click=self.ban_unban_employee
+                ).props(st.BUTTON_PROPS).classes(st.BUTTON)
+            ui.button('НАЗАД', on_click=ui.navigate.back).props(st.BUTTON_PROPS).classes(st.BUTTON)
+
+    async def load_new_messages(self) -> None:
+        """Получаем по курсору только сообщения, которых еще нет на странице."""
+        # Опрос по таймеру и отправка ответа не должны вывести одно сообщение дважды
+        if self._lock.locked():
+            return
+
+        async with self._lock:
+            try:
+                chat: EmployeeChatSchema = await messages_api_client.get_chat(
+                    self.chat.id, after=self.next_cursor
+                )
+            except (ClientError, asyncio.TimeoutError, ValidationError):
+                return
+
+            new_messages = chat.messages.items
+            self.next_cursor = chat.messages.next_cursor
+            with self.messages_card:
+                for message in new_messages:
+                    _render_message(message, self.chat.name)
+
+            if any(not message.is_read for message in new_messages):
+                self.unread_pending = True
+            if self.unread_pending:
+                try:
+                    await messages_api_client.mark_chat_as_read(self.chat.id)
+                    self.unread_pending = False
+                except (ClientError, asyncio.TimeoutError):
+                    pass
+
+            # Статус блокировки мог изменить другой менеджер
+            if chat.is_banned != self.chat.is_banned:
+                self.chat.is_banned = chat.is_banned
+                self.header.refresh()
+                self.controls.refresh()
+
+    async def load_older_messages(self) -> None:
+        """Подгружаем по курсору страницу более ранних сообщений над уже выведенными."""
+        try:
+            chat: EmployeeChatSchema = await messages_api_client.get_chat(
+                self.chat.id, before=self.prev_cursor
+            )
+        except (ClientError, asyncio.TimeoutError, ValidationError):
+            ui.notify(ERROR_MESSAGE_LOAD_FAILED, type='negative')
+            return
+
+        self.prev_cursor = chat.messages.prev_cursor
+        with self.older_messages:
+            page_block = ui.column().classes(st.FULL_WIDTH)
+        page_block.move(self.older_messages, target_index=0)
+        with page_block:
+            for message in chat.messages.items:
+                _render_message(message, self.chat.name)
+        self.older_button.visible = self.prev_cursor is not None
 
-    if result['OK']:
-        ui.notify(result['message'], type='positive')
-        await asyncio.sleep(1)
-        ui.navigate.to(MESSAGES_PAGE_URL)
-    else:
-        ui.notify(result['message'], type='negative')
+    async def send_message(self) -> None:
+        """Обрабатываем нажатие кнопки Отправить сообщение."""
+        data_input = {
+            'employee_id': self.chat.id,
+            'text': self.new_message_input.value,
+            'manager_id': self.manager_id,
+        }
+        result = await messages_api_client.send_message(data_input)
+
+        if result['OK']:
+            ui.notify(result['message'], type='positive')
+            self.new_message_input.value = ''
+            await self.load_new_messages()
+        else:
+            ui.notify(result['message'], type='negative')
+
+    async def ban_unban_employee(self) -> None:
+        """Обрабатываем нажатие кнопки Забанить/Разбанить сотрудника."""
+        data_input = {'is_banned': not self.chat.is_banned, 'updated_by_id': self.manager_id}
+        result = await messages_api_client.ban_unban_employee(self.chat.id, data_input)
+
+        if result['OK']:
+            ui.notify(result['message'], type='positive')
+            self.chat.is_banned = not self.chat.is_banned
+            self.header.refresh()
+            self.controls.refresh()
+        else:
+            ui.notify(result['message'], type='negative')
+
+
+def _chat_list_filters(
+    unread: bool | None,
+    is_banned: bool | None,
+    name: str | None,
+) -> Callable:
+    """Выводим фильтры списка чатов, возвращаем функцию перехода по страницам."""
+    with ui.card().classes(st.FULL_WIDTH):
+        with ui.row().classes(st.FULL_WIDTH + ' items-stretch gap-4'):
+            unread_select = ui.select(
+                options={None: 'Все чаты', True: 'С непрочитанными', False: 'Прочитанные'},
+                label='Сообщения: ',
+                value=unread,
+                on_change=lambda: ui.navigate.to(
+                    build_url(
+                        MESSAGES_PAGE_URL,
+                        unread=unread_select.value,
+                        is_banned=is_banned,
+                        name=name)),
+            ).props(st.INPUT_PROPS).classes(st.QUARTER_WIDTH)
+            is_banned_select = ui.select(
+                options={None: 'Все сотрудники', True: 'Забаненные', False: 'Незабаненные'},
+                label='Бан: ',
+                value=is_banned,
+                on_change=lambda: ui.navigate.to(
+                    build_url(
+                        MESSAGES_PAGE_URL,
+                        unread=unread_select.value,
+                        is_banned=is_banned_select.value,
+                        name=name)),
+            ).props(st.INPUT_PROPS).classes(st.QUARTER_WIDTH)
+            name_input = ui.input(
+                label='Поиск по имени: ',
+                value=name if name else '',
+            ).props('clearable').props(st.INPUT_PROPS).classes(st.QUARTER_WIDTH)
+            name_input.on(
+                type='keydown.enter',
+                handler=lambda: ui.navigate.to(
+                    build_url(
+                        MESSAGES_PAGE_URL,
+                        unread=unread_select.value,
+                        is_banned=is_banned_select.value,
+                        name=name_input.value)))
+            name_input.on(
+                type='clear',
+                handler=lambda: ui.navigate.to(
+                    build_url(
+                        MESSAGES_PAGE_URL,
+                        unread=unread_select.value,
+                        is_banned=is_banned_select.value)))
+
+    def navigate_to_filtered_list(current_page: int) -> None:
+        ui.navigate.to(
+            build_url(
+                MESSAGES_PAGE_URL,
+                page=current_page,
+                unread=unread_select.value,
+                is_banned=is_banned_select.value,
+                name=name_input.value,
+            )
+        )
+
+    return navigate_to_filtered_list
 
 
 @messages_router.page('/', title='Чаты')
 async def chats_list_page(
+    page: int = 1,
+    unread: bool | None = None,
+    is_banned: bool | None = None,
+    name: str | None = None,
     current_user: UserReadSchema = Depends(get_current_user),
 ) -> None:
     """Страница со списком чатов с сотрудниками."""
@@ -63,25 +269,57 @@ async def chats_list_page(
 
     navbar(current_user)
 
-    # Получаем список пользователей согласно фильтрам
-    chats: list[EmployeeChatListSchema] = await messages_api_client.get_chats()
+    # Получаем страницу списка чатов согласно фильтрам
+    try:
+        chats: EmployeeChatListPageSchema | None = await messages_api_client.get_chats(
+            page, unread, is_banned, name)
+    except (ClientError, asyncio.TimeoutError):
+        chats = None
+
+    if not chats:
+        ui.notify(ERROR_MESSAGE_CHATS_LOAD_FAILED, type='negative')
+        return
 
     # Выводим заголовок
     ui.item_label('Чаты').classes(st.PAGE_HEADER)
+    ui.item_label(f'Всего чатов: {chats.total}').classes(st.PAGE_SUBHEADER)
+
+    # Выводим фильтры, получаем функцию для перехода по страницам
+    navigate_func: Callable = _chat_list_filters(unread, is_banned, name)
+
+    # Выводим список чатов таблицей с виртуальной прокруткой
+    columns = [
+        {'name': 'name', 'label': 'Сотрудник', 'field': 'name', 'align': 'left'},
+        {'name': 'unread_count', 'label': 'Непрочитанные', 'field': 'unread_count'},
+        {'name': 'last_message_at', 'label': 'Последнее сообщение', 'field': 'last_message_at'},
+        {'name': 'is_banned', 'label': 'Бан', 'field': 'is_banned'},
+    ]
+    rows = [
+        {
+            'id': chat.id,
+            'name': f'{chat.id} - {chat.name}',
+            'unread_count': chat.unread_count or '',
+            'last_message_at': (
+                chat.last_message_at.strftime(s.DATETIME_FORMAT) if chat.last_message_at else ''
+            ),
+            'is_banned': 'БАН' if chat.is_banned else '',
+        }
+        for chat in chats.items
+    ]
+    table = ui.table(
+        columns=columns, rows=rows, row_key='id', pagination=0
+    ).props(st.TABLE_PROPS).classes(st.TABLE)
+    table.on('rowClick', lambda e: ui.navigate.to(f'{e.args[1]["id"]}/chat'))
 
-    # Выводим список чатов
-    for chat in chats:
-        with ui.card().classes('w-full'):
-            with ui.row():
-                ui.label(str(chat.id) + ' - ' + chat.name).classes(st.LABEL_BOLD + ' self-center')
-                if chat.is_banned:
-                    ui.chip('БАН', icon='block', color='red')
-                with ui.button(
-                    'ПЕРЕЙТИ',
-                    on_click=lambda s_id=chat.id: ui.navigate.to(f'{s_id}/chat'),
-                ).props(st.BUTTON_PROPS).classes(st.BUTTON):
-                    if chat.unread_count:
-                        ui.badge(chat.unread_count, color='red').props('floating')
+    # Выводим кнопки пагинации
+    if chats.pages > 1:
+        current_page = ui.pagination(
+            1,
+            chats.pages,
+            value=chats.page,
+            direction_links=True,
+            on_change=lambda: navigate_func(current_page.value),
+        ).props(st.PAGINATION_PROPS).classes(st.PAGINATION)
 
 
 @messages_router.page('/{chat_id}/chat', title='Чат с сотрудником')
@@ -96,51 +334,14 @@ async def chat_page(
 
     navbar(current_user)
 
-    # Получаем част с сотрудником
+    # Получаем чат с сотрудником
     chat: EmployeeChatSchema = await messages_api_client.get_chat(chat_id)
+    chat_view = ChatView(chat, current_user.id if current_user else None, permission)
 
-    # Выводим заголовки страницы
-    ui.item_label(f'Чат с сотрудником {chat.name}').classes(st.PAGE_HEADER)
-    if chat.is_banned:
-        ui.item_label('БАН').classes(st.LABEL_RED)
-    # Выводим чат
-
-    with ui.card().classes(st.THIRD_WIDTH):
-        for message in chat.messages.items:
-            with ui.row().classes('w-full mb-2'):
-                with ui.row().classes(st.ALIGN_RIGTH if bool(message.manager) else st.ALIGN_LEFT):
-                    message_element = ui.chat_message(
-                        text=message.text,
-                        name=chat.name if message.manager is None else message.manager.username,
-                        sent=bool(message.manager),
-                        stamp=message.created_at_str,
-                    ).classes('inline-block max-w-[70%]')
-                    # Выделяем непрочитанные сообщения
-                    if not message.is_read:
-                        message_element.classes(st.LABEL_BOLD)
-
+    chat_view.header()
+    chat_view.messages()
     await messages_api_client.mark_chat_as_read(chat_id)
+    chat_view.controls()
 
-    with ui.row():
-        # Выводим Поле для ввода ответа и кнопку Отправить
-        if permission:
-            new_message_input = ui.input(
-                placeholder='Введите ответ',
-                validation={
-                    ERROR_MESSAGE_TOO_LONG: lambda value: 0
-                    < len(value)
-                    < MESSAGE_TEXT_MAX_LENGTH
-                },
-            ).props(st.INPUT_PROPS).classes(st.INPUT)
-            ui.button(
-                'ОТПРАВИТЬ',
-                on_click=partial(
-                    lambda: _send_message_button_handler(chat.id, new_message_input.value, current_user.id)),
-            ).props(st.BUTTON_PROPS).classes(st.BUTTON)
-            ban_button_title = 'РАЗБАНИТЬ СОТРУДНИКА' if chat.is_banned else 'ЗАБАНИТЬ СОТРУДНИКА'
-            ui.button(
-                ban_button_title,
-                on_click=partial(
-                    lambda: _ban_unban_employee_button_handler(chat.id, chat.is_banned, current_user.id)),
-            ).props(st.BUTTON_PROPS).classes(st.BUTTON)
-        ui.button('НАЗАД', on_click=ui.navigate.back).props(st.BUTTON_PROPS).classes(st.BUTTON)
+    # Новые сообщения сотрудника и ответы других менеджеров дописываем по таймеру
+    ui.timer(CHAT_POLL_INTERVAL_IN_SECONDS, chat_view.load_new_messages)
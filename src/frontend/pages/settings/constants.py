@@ -5,3 +5,6 @@ SETTING_DESCRIPTION_MAX_LEN = 255
 
 ERROR_MESSAGE_INT_TYPE = 'Значение должно быть целым числом'
 ERROR_MESSAGE_VALUE_INT = 'Значение должно быть не менее 1 и не более 10'
+CONFIRM_RESTORE_SETTINGS = (
+    'Восстановить настройки из последней копии? Текущие данные тоже будут сохранены в копию.'
+)
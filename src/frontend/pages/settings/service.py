@@ -31,5 +31,10 @@ class SettingsApiClient(BaseApiClient):
         url = f'{settings.API_URL}/{self.MODULE_URL}/upload'
         return await self.post(url, {})
 
+    async def restore_settings(self) -> dict:
+        """Восстановить настройки проекта из копии, снятой перед последней загрузкой."""
+        url = f'{settings.API_URL}/{self.MODULE_URL}/restore'
+        return await self.post(url, {})
+
 
 settings_api_client = SettingsApiClient()
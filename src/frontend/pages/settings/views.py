@@ -6,8 +6,9 @@ from fastapi import Depends
 from nicegui import APIRouter, ui
 
 from pages.dependencies import get_current_user, get_edit_settings_permission
-from pages.layout import navbar
+from pages.layout import confirm, navbar
 from pages.settings.constants import (
+    CONFIRM_RESTORE_SETTINGS,
     SETTING_INT_MAX_VALUE,
     SETTING_VALUE_MAX_LEN,
 )
@@ -84,6 +85,12 @@ async def _download_upload_settings_button_handler(func: Callable) -> None:
         ui.notify(result['message'], type='negative')
 
 
+async def _restore_settings_button_handler() -> None:
+    """Обрабатываем нажатие кнопки Отменить загрузку после подтверждения."""
+    if await confirm(CONFIRM_RESTORE_SETTINGS):
+        await _download_upload_settings_button_handler(settings_api_client.restore_settings)
+
+
 @settings_router.page('/', title='Настройки проекта')
 async def settings_list_page(
     current_user: UserReadSchema = Depends(get_current_user),
@@ -110,6 +117,10 @@ async def settings_list_page(
                     'ЗАГРУЗИТЬ ИЗ ФАЙЛА',
                     on_click=lambda x=settings_api_client.upload_settings: _download_upload_settings_button_handler(x),
                 ).props(st.BUTTON_PROPS).classes(st.BUTTON)
+                ui.button(
+                    'ОТМЕНИТЬ ЗАГРУЗКУ',
+                    on_click=_restore_settings_button_handler,
+                ).props(st.BUTTON_PROPS).classes(st.BUTTON)
 
     if settings_list:
         for setting in settings_list:
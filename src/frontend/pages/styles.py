@@ -27,6 +27,10 @@ GRID = 'items-center gap-y-4 gap-x-6'
 
 SELECT = 'w-1/2 text-gray'
 
+# Высота таблицы постоянна, строки за пределами видимой области не отрисовываются
+TABLE_PROPS = 'flat bordered virtual-scroll hide-bottom'
+TABLE = 'w-full h-[70vh]'
+
 FULL_WIDTH = 'w-full'
 HALF_WIDTH = 'w-1/2'
 THIRD_WIDTH = 'w-1/3'
@@ -22,7 +22,6 @@ from pages.users.schemas import (
     UserCreateSchema,
     UserReadSchema,
     UserUpdateSchema,
-    UsersListPageSchema,
 )
 from pages.users.service import users_api_client
 from pages.utils import build_url
@@ -127,11 +126,9 @@ def _validate_password(value: str | None) -> str | None:
 
 async def _edit_user_form_handler(
     user_data: dict,
+    roles: dict | None,
 ) -> None:
     """Вывод полей формы создания/изменения пользователя."""
-    # Получаем список ролей для вывода опции в поле выбора
-    roles: dict | None = await users_api_client.get_roles()
-
     with ui.grid(columns=2):
         ui.label('id: ').classes(st.LABEL_BOLD)
         ui.label(user_data['id']).classes(st.LABEL)
@@ -252,12 +249,11 @@ async def users_list_page(
 
     navbar(current_user)
 
-    # Получаем список пользователей согласно фильтрам
-    users_list: UsersListPageSchema | None = await users_api_client.get_users(
-        page, role, is_active, name)
-
-    # Получаем список ролей для опции фильтрации
-    roles: dict | None = await users_api_client.get_roles()
+    # Получаем список пользователей согласно фильтрам и список ролей для опции фильтрации
+    users_list, roles = await asyncio.gather(
+        users_api_client.get_users(page, role, is_active, name),
+        users_api_client.get_roles(),
+    )
 
     # Выводим заголовок
     ui.item_label('Пользователи').classes(st.PAGE_HEADER)
@@ -348,9 +344,11 @@ async def user_edit_page(
 
     navbar(current_user)
 
-    # Получаем данные пользователя
-    user_data: dict | None = await users_api_client.get_user(user_id)
-    user_data['updated_by_id'] = current_user.id
+    # Получаем данные пользователя и список ролей для вывода опции в поле выбора
+    user_data, roles = await asyncio.gather(
+        users_api_client.get_user(user_id),
+        users_api_client.get_roles(),
+    )
 
     if user_data is None:
         ui.notify('Указанный пользователь не существует', type='negative')
@@ -360,7 +358,8 @@ async def user_edit_page(
         ui.item_label('Изменение пользователя').classes(st.PAGE_HEADER)
         # Выводим поля формы пользователя
         with ui.card().classes('w-full'):
-            await _edit_user_form_handler(user_data)
+            user_data['updated_by_id'] = current_user.id
+            await _edit_user_form_handler(user_data, roles)
             with ui.row():
                 # Выводим кнопки Сохранить и Назад
                 ui.button(